@@ -10,39 +10,78 @@ import json
 import urllib.request
 import urllib.parse
 import time
+from collections import OrderedDict
 from datetime import datetime
 
+from cleantempmail import InboxCursor
+from seen_store import SQLiteSeenStore
+
 # Configuration
 API_KEY = "ct-test"
 BASE_URL = "https://cleantempmail.com/api"
 POLL_INTERVAL = 5  # seconds
+SEEN_DB = "seen_emails.db"  # remembers handled emails across restarts
+MAX_CACHED_RESPONSES = 64  # URLs whose last response is kept for conditional requests
+
+
+# Validators and last response body per URL (least recently used first)
+_last_response = OrderedDict()
 
 
 def get_emails(email_address):
-    """Get all emails for a specific address."""
+    """
+    Get all emails for a specific address.
+    
+    Sends If-None-Match / If-Modified-Since from the previous response so
+    the server can answer 304 Not Modified instead of resending the inbox;
+    the kept body is then parsed again, so each call returns its own list.
+    """
     params = urllib.parse.urlencode({"email": email_address})
     url = f"{BASE_URL}/emails?{params}"
     headers = {"X-API-Key": API_KEY}
     
+    previous = _last_response.get(url)
+    if previous:
+        _last_response.move_to_end(url)
+        etag, last_modified, _ = previous
+        if etag:
+            headers["If-None-Match"] = etag
+        elif last_modified:
+            headers["If-Modified-Since"] = last_modified
+    
     req = urllib.request.Request(url, headers=headers)
     
     try:
         with urllib.request.urlopen(req) as response:
-            data = json.loads(response.read().decode())
+            body = response.read()
+            data = json.loads(body.decode())
             if data.get("success"):
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                if etag or last_modified:
+                    _last_response[url] = (etag, last_modified, body)
+                    _last_response.move_to_end(url)
+                    while len(_last_response) > MAX_CACHED_RESPONSES:
+                        _last_response.popitem(last=False)
                 return data["data"]["emails"]
+    except urllib.error.HTTPError as e:
+        # Nothing changed since the last poll
+        if e.code == 304 and previous:
+            return json.loads(previous[2].decode())["data"]["emails"]
     except:
         pass
     return []
 
 
-def auto_poll(email_address, duration_minutes=5):
+def auto_poll(email_address, duration_minutes=5, store=None):
     """
     Automatically poll for new emails.
     
     Args:
         email_address (str): Email address to monitor
         duration_minutes (int): How long to monitor (minutes)
+        store (SeenStore): Emails already handled, kept across restarts (optional,
+            e.g. SQLiteSeenStore)
     """
     
     print(f"🔄 Monitoring: {email_address}")
@@ -51,7 +90,9 @@ def auto_poll(email_address, duration_minutes=5):
     print("\nPress Ctrl+C to stop monitoring\n")
     print("=" * 60)
     
-    seen_ids = set()
+    # Remembers only the newest timestamp seen, so memory stays bounded
+    cursor = InboxCursor()
+    received = 0
     start_time = time.time()
     end_time = start_time + (duration_minutes * 60)
     
@@ -60,12 +101,14 @@ def auto_poll(email_address, duration_minutes=5):
             emails = get_emails(email_address)
             
             # Check for new emails
-            new_emails = [e for e in emails if e['id'] not in seen_ids]
+            new_emails = cursor.advance(emails)
+            if store is not None and new_emails:
+                # Skip emails a previous run already handled
+                new_emails = store.filter_new(email_address, new_emails)
             
             if new_emails:
+                received += len(new_emails)
                 for email in new_emails:
-                    seen_ids.add(email['id'])
-                    
                     # Display notification
                     timestamp = datetime.fromtimestamp(email.get('timestamp', 0))
                     print(f"\n📧 NEW EMAIL RECEIVED!")
@@ -82,11 +125,14 @@ def auto_poll(email_address, duration_minutes=5):
             time.sleep(POLL_INTERVAL)
         
         print(f"\n\n✅ Monitoring completed")
-        print(f"📊 Total emails received: {len(seen_ids)}")
-        
+        print(f"📊 Total emails received: {received}")
+    
     except KeyboardInterrupt:
         print(f"\n\n⏹️  Monitoring stopped by user")
-        print(f"📊 Total emails received: {len(seen_ids)}")
+        print(f"📊 Total emails received: {received}")
+    finally:
+        if store is not None:
+            store.flush()
 
 
 if __name__ == "__main__":
@@ -107,9 +153,11 @@ if __name__ == "__main__":
         duration = 5
     
     print()
-    auto_poll(email_address, duration)
+    with SQLiteSeenStore(SEEN_DB) as store:
+        auto_poll(email_address, duration, store)
     
     print("\n💡 Tips:")
     print("- Use this for automated testing workflows")
     print("- Combine with verification code extraction")
     print("- Adjust POLL_INTERVAL based on your needs")
+    print(f"- Handled emails are remembered in {SEEN_DB}, so restarts do not repeat them")
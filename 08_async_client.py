@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Example 8: Async/Await API Client
+
+This example shows how to monitor many temporary email addresses
+concurrently from a single event loop using AsyncCleanTempMailClient.
+
+Requires aiohttp: pip install -r requirements.txt
+"""
+
+import asyncio
+
+from cleantempmail_async import AsyncCleanTempMailClient
+
+# Configuration
+API_KEY = "ct-test"
+ADDRESS_COUNT = 5
+TIMEOUT = 60  # seconds
+
+
+async def watch(client, email_address):
+    """Wait for the first email on one address and report it."""
+    email = await client.wait_for_email(email_address, timeout=TIMEOUT)
+    if email:
+        print(f"📧 {email_address}: {email['subject']} (from {email['from_address']})")
+    else:
+        print(f"⏰ {email_address}: no email within {TIMEOUT}s")
+    return email
+
+
+async def main():
+    async with AsyncCleanTempMailClient(API_KEY, max_concurrency=20) as client:
+        # Generate all addresses concurrently
+        addresses = await asyncio.gather(*(client.generate_email() for _ in range(ADDRESS_COUNT)))
+        
+        print(f"✅ Generated {len(addresses)} addresses:")
+        for address in addresses:
+            print(f"   {address}")
+        
+        print(f"\n📤 Send test emails to any of these addresses...")
+        print(f"⏳ Watching all of them for up to {TIMEOUT} seconds...\n")
+        
+        # Monitor every address at once on a single thread
+        results = await asyncio.gather(*(watch(client, address) for address in addresses))
+        
+        received = sum(1 for email in results if email)
+        print(f"\n📊 Received emails on {received}/{len(addresses)} addresses")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("CleanTempMail API - Example 8: Async Client")
+    print("=" * 60)
+    print()
+    
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Stopped by user")
+    
+    print("\n💡 Tips:")
+    print("- One event loop can watch thousands of addresses")
+    print("- Raise max_concurrency to allow more requests in flight")
+    print("- Share one client across tasks to reuse its connection pool")
@@ -9,21 +9,13 @@ from emails using regular expressions.
 import json
 import urllib.request
 import urllib.parse
-import re
+
+from code_extractor import extract_batch, extract_candidates
 
 # Configuration
 API_KEY = "ct-test"
 BASE_URL = "https://cleantempmail.com/api"
 
-# Common verification code patterns
-PATTERNS = [
-    r'\b\d{6}\b',  # 6-digit code
-    r'\b\d{4}\b',  # 4-digit code
-    r'\b[A-Z0-9]{8}\b',  # 8-character alphanumeric
-    r'code[:\s]+([A-Z0-9-]{4,})',  # After "code:"
-    r'verification[:\s]+([A-Z0-9-]{4,})',  # After "verification:"
-]
-
 
 def get_emails(email_address):
     """Get all emails for a specific address."""
@@ -47,29 +39,17 @@ def extract_codes(text):
     """
     Extract potential verification codes from text.
     
+    All patterns (6-digit, 4-digit, 8-character alphanumeric, and codes
+    after "code:" / "verification:") are matched in a single pass by
+    code_extractor; codes are returned most likely first.
+    
     Args:
         text (str): Email content
     
     Returns:
         list: List of potential codes
     """
-    codes = []
-    
-    for pattern in PATTERNS:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        codes.extend(matches)
-    
-    # Remove duplicates and filter
-    unique_codes = []
-    seen = set()
-    
-    for code in codes:
-        code = code.strip()
-        if code and code not in seen:
-            seen.add(code)
-            unique_codes.append(code)
-    
-    return unique_codes
+    return [candidate.code for candidate in extract_candidates(text)]
 
 
 def find_verification_codes(email_address, keyword=None):
@@ -89,22 +69,25 @@ def find_verification_codes(email_address, keyword=None):
     if not emails:
         return {}
     
+    # Filter by keyword if provided
+    if keyword:
+        keyword = keyword.lower()
+        emails = [e for e in emails if keyword in e['subject'].lower()]
+    
+    # Extract codes from subject and content, HTML converted to text (large batches run on a process pool)
+    candidates_by_id = extract_batch(emails)
+    
     results = {}
     
     for email in emails:
-        # Filter by keyword if provided
-        if keyword and keyword.lower() not in email['subject'].lower():
-            continue
-        
-        # Extract codes from both subject and content
-        text = f"{email['subject']} {email.get('content', '')}"
-        codes = extract_codes(text)
+        candidates = candidates_by_id.get(email['id'])
         
-        if codes:
+        if candidates:
             results[email['id']] = {
                 'subject': email['subject'],
                 'from': email['from_address'],
-                'codes': codes
+                'codes': [c.code for c in candidates],
+                'best': candidates[0]
             }
     
     return results
@@ -145,20 +128,17 @@ if __name__ == "__main__":
             print("=" * 60)
             print()
         
-        # Show most likely code
-        all_codes = []
+        # Show most likely code (codes are ordered best first)
+        best = None
         for data in results.values():
-            all_codes.extend(data['codes'])
+            candidate = data['best']
+            if best is None or candidate.score > best.score:
+                best = candidate
         
-        if all_codes:
-            # Prefer 6-digit codes
-            six_digit = [c for c in all_codes if re.match(r'^\d{6}$', c)]
-            if six_digit:
-                print(f"🎯 Most likely code: {six_digit[0]}")
-            else:
-                print(f"🎯 First code found: {all_codes[0]}")
+        if best:
+            print(f"🎯 Most likely code: {best.code}")
         
         print("\n💡 Tips:")
         print("- The most common format is 6-digit numeric codes")
-        print("- Codes are extracted using multiple patterns")
+        print("- Codes are ranked by shape and closeness to words like 'code'")
         print("- Check the email subject for quick access")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Pre-warmed Address Pool
+
+Keeps temporary email addresses generated ahead of time so callers can
+take one without waiting for an API round trip. Addresses are pooled
+separately for each (prefix, domain) combination and refilled in the
+background whenever a pool drops below its low-water mark.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from cleantempmail import CleanTempMailClient
+
+
+class _Stock:
+    """Addresses and counters for one (prefix, domain) pool."""
+    
+    def __init__(self):
+        self.addresses = deque()
+        self.inflight = 0
+        self.last_error = None
+        self.acquired = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.generated = 0
+        self.errors = 0
+
+
+class AddressPool:
+    """
+    Thread-safe pool of pre-generated addresses.
+    
+    acquire() returns immediately while the pool for the requested
+    prefix/domain has stock, and waits for a background generation
+    otherwise. Each acquired address is handed out once.
+    """
+    
+    def __init__(self, client: CleanTempMailClient, size: int = 10, low_water: Optional[int] = None,
+                 max_workers: int = 2, warm: Iterable[Tuple[Optional[str], Optional[str]]] = ((None, None),)):
+        """
+        Initialize the pool and start filling it.
+        
+        Args:
+            client: Client used to generate addresses
+            size: Addresses to keep ready per prefix/domain
+            low_water: Refill once fewer than this many are left (default: size // 2)
+            max_workers: Background threads generating addresses
+            warm: (prefix, domain) pools to fill right away
+        """
+        self.client = client
+        self.size = size
+        self.low_water = low_water if low_water is not None else size // 2
+        self._stocks = {}
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="address-pool")
+        self._closed = False
+        for prefix, domain in warm:
+            self.warm(prefix, domain)
+    
+    def _stock(self, key) -> _Stock:
+        stock = self._stocks.get(key)
+        if stock is None:
+            stock = self._stocks[key] = _Stock()
+        return stock
+    
+    def _schedule_refill(self, key, stock: _Stock):
+        """Top a pool up to `size`; called with the lock held."""
+        if self._closed:
+            return
+        missing = self.size - len(stock.addresses) - stock.inflight
+        for _ in range(missing):
+            stock.inflight += 1
+            self._executor.submit(self._generate, key, stock)
+    
+    def _generate(self, key, stock: _Stock):
+        prefix, domain = key
+        try:
+            address = self.client.generate_email(prefix=prefix, domain=domain)
+        except Exception as e:
+            with self._cond:
+                stock.inflight -= 1
+                stock.errors += 1
+                stock.last_error = e
+                self._cond.notify_all()
+            return
+        with self._cond:
+            stock.inflight -= 1
+            stock.generated += 1
+            stock.addresses.append(address)
+            self._cond.notify_all()
+    
+    def warm(self, prefix: Optional[str] = None, domain: Optional[str] = None):
+        """Start filling the pool for prefix/domain without taking an address."""
+        key = (prefix, domain)
+        with self._cond:
+            self._schedule_refill(key, self._stock(key))
+    
+    def acquire(self, prefix: Optional[str] = None, domain: Optional[str] = None,
+                timeout: Optional[float] = None) -> str:
+        """
+        Take a pre-generated address.
+        
+        Args:
+            prefix: Custom prefix (optional)
+            domain: Specific domain (optional)
+            timeout: Longest time to wait when the pool is empty (default: no limit)
+        
+        Returns:
+            str: Email address
+        
+        Raises:
+            TimeoutError: If no address became available within timeout
+            RuntimeError: If the pool is (or gets) closed while it is empty
+            Exception: The generation error, if the pool is empty and refilling failed
+        """
+        key = (prefix, domain)
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("AddressPool is closed")
+            stock = self._stock(key)
+            
+            while not stock.addresses:
+                if stock.inflight == 0:
+                    if stock.last_error is not None:
+                        error, stock.last_error = stock.last_error, None
+                        raise error
+                    if self._closed:
+                        # Nothing will refill the pool any more
+                        raise RuntimeError("AddressPool is closed")
+                    self._schedule_refill(key, stock)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No address available for prefix={prefix!r} domain={domain!r}")
+                self._cond.wait(remaining)
+            
+            address = stock.addresses.popleft()
+            stock.acquired += 1
+            waited = time.monotonic() - started
+            if waited > 0.001:
+                stock.waited += 1
+                stock.wait_seconds += waited
+                stock.max_wait_seconds = max(stock.max_wait_seconds, waited)
+            if len(stock.addresses) + stock.inflight < self.low_water:
+                self._schedule_refill(key, stock)
+            return address
+    
+    def depth(self, prefix: Optional[str] = None, domain: Optional[str] = None) -> int:
+        """Return how many addresses are ready for prefix/domain."""
+        with self._cond:
+            stock = self._stocks.get((prefix, domain))
+            return len(stock.addresses) if stock else 0
+    
+    def stats(self) -> Dict:
+        """Return depth and acquire-wait metrics per (prefix, domain)."""
+        with self._cond:
+            return {
+                key: {
+                    'depth': len(stock.addresses),
+                    'inflight': stock.inflight,
+                    'acquired': stock.acquired,
+                    'waited': stock.waited,
+                    'wait_seconds': stock.wait_seconds,
+                    'avg_wait_seconds': stock.wait_seconds / stock.acquired if stock.acquired else 0.0,
+                    'max_wait_seconds': stock.max_wait_seconds,
+                    'generated': stock.generated,
+                    'errors': stock.errors,
+                }
+                for key, stock in self._stocks.items()
+            }
+    
+    def close(self):
+        """Stop refilling and wait for generations in progress."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._executor.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    with AddressPool(CleanTempMailClient("ct-test"), size=5) as pool:
+        print("Testing AddressPool...")
+        print()
+        
+        for _ in range(3):
+            print(f"✅ Acquired: {pool.acquire()}")
+        
+        print(f"\n📊 Stats: {pool.stats()}")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark suite for CleanTempMailClient.
+
+Runs every client method against the local stand-in server and reports,
+per endpoint, throughput, p50 / p99 latency and the peak memory
+allocated per call (tracemalloc). Compare runs to catch regressions
+without touching the live service.
+
+Usage:
+    python3 benchmarks/bench_client.py [calls] [inbox_size] [latency] [error_rate]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleantempmail import CleanTempMailClient, RetryPolicy
+from standin_server import start_process
+
+ADDRESS = "bench@cleantempmail.com"
+
+# Benchmark name -> call
+CASES = [
+    ("generate_email", lambda c: c.generate_email()),
+    ("generate_email(prefix)", lambda c: c.generate_email(prefix="bench")),
+    ("get_emails", lambda c: c.get_emails(ADDRESS)),
+    ("get_email", lambda c: c.get_email("email-1")),
+    ("delete_email", lambda c: c.delete_email("email-1")),
+    ("clear_inbox", lambda c: c.clear_inbox(ADDRESS)),
+    ("get_statistics", lambda c: c.get_statistics()),
+    ("get_24h_distribution", lambda c: c.get_24h_distribution()),
+    ("get_top_subjects", lambda c: c.get_top_subjects()),
+]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def measure(client, call, calls):
+    """Return (calls/s, p50 ms, p99 ms, errors, peak KiB allocated per call)."""
+    call(client)  # warm up the connection
+    
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        try:
+            call(client)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    
+    # Peak traced memory of a few calls, measured separately (tracing is slow)
+    samples = min(calls, 20)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            try:
+                call(client)
+            except Exception:
+                pass
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    
+    return (calls / elapsed, percentile(latencies, 0.50) * 1000, percentile(latencies, 0.99) * 1000,
+            errors, sum(peaks) / len(peaks) / 1024)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    calls = int(args[0]) if len(args) > 0 else 500
+    inbox_size = int(args[1]) if len(args) > 1 else 50
+    latency = float(args[2]) if len(args) > 2 else 0.0
+    error_rate = float(args[3]) if len(args) > 3 else 0.0
+    
+    # Separate process, so KiB/call counts only the client's allocations
+    server, base_url = start_process(inbox_size=inbox_size, latency=latency, error_rate=error_rate, seed=1)
+    # Unconditional GETs: the stand-in's responses never change, so with
+    # conditional requests every call after the first would measure a 304
+    client = CleanTempMailClient("ct-test", base_url, retry=RetryPolicy(backoff=0.001), conditional=False)
+    try:
+        print(f"{calls} calls per endpoint, inbox_size={inbox_size}, "
+              f"latency={latency * 1000:.1f}ms, error_rate={error_rate:.0%}\n")
+        print(f"  {'endpoint':<24}{'calls/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'KiB/call':>10}")
+        for name, call in CASES:
+            rate, p50, p99, errors, kib = measure(client, call, calls)
+            print(f"  {name:<24}{rate:>10.0f}{p50:>10.3f}{p99:>10.3f}{errors:>8}{kib:>10.1f}")
+    finally:
+        client.close()
+        server.terminate()
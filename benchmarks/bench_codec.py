@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON codecs on realistic /emails payloads.
+
+Decodes the same /emails response body with the legacy
+json.loads(body.decode()) and with every installed JSONCodec, and
+reports MB/s and emails/s for a few inbox sizes.
+
+Usage:
+    python3 benchmarks/bench_codec.py [rounds]
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleantempmail import JSONCodec, OrjsonCodec, UjsonCodec
+from corpus import make_corpus
+
+
+def payload(count):
+    """Serialized /emails response built from the synthetic corpus."""
+    emails = []
+    for i, e in enumerate(make_corpus(count)):
+        emails.append({
+            "id": e["id"],
+            "from_address": f"sender{i % 500}@example.com",
+            "email_address": "user@cleantempmail.com",
+            "subject": e["subject"],
+            "timestamp": 1700000000 + i,
+            "content": e["content"],
+            "has_html": False,
+        })
+    return json.dumps({"success": True, "data": {"emails": emails}}).encode("utf-8")
+
+
+def codecs():
+    yield "json.loads(decode())", lambda body: json.loads(body.decode())
+    for codec_class in (JSONCodec, OrjsonCodec, UjsonCodec):
+        try:
+            codec = codec_class()
+        except ImportError:
+            print(f"  ({codec_class.name} not installed)")
+            continue
+        yield f"{codec.name} codec", codec.loads
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for count in (10, 100, 500):
+        body = payload(count)
+        print(f"\n/emails with {count} emails ({len(body) / 1024:.0f} KiB)")
+        expected = json.loads(body)
+        for name, loads in codecs():
+            assert loads(body) == expected
+            repeat = max(1, rounds * 500 // count)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                loads(body)
+            elapsed = (time.perf_counter() - start) / repeat
+            print(f"  {name:<22} {len(body) / elapsed / 1e6:8.1f} MB/s   {count / elapsed:12,.0f} emails/s")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark: gzip-compressed vs. uncompressed inbox listings.
+
+Fetches a large inbox from the stand-in server (running with gzip
+enabled) with and without Accept-Encoding, and reports bytes on the
+wire, the compression ratio, client time on the loopback interface and
+the transfer time the payload would take over a slower link. The
+stand-in's emails are very repetitive, so real inboxes compress less.
+
+Usage:
+    python3 benchmarks/bench_compression.py [inbox_size] [mbit_per_s]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleantempmail import CleanTempMailClient, MetricsCollector
+from standin_server import start_process
+
+ADDRESS = "bench@cleantempmail.com"
+ROUNDS = 20
+
+
+def run(name, base_url, compression, mbit_per_s, read_inbox):
+    client = CleanTempMailClient("ct-test", base_url, conditional=False, compression=compression)
+    metrics = MetricsCollector().install(client)
+    try:
+        read_inbox(client)  # warm up
+        metrics.reset()
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            read_inbox(client)
+        elapsed = (time.perf_counter() - start) / ROUNDS
+    finally:
+        client.close()
+    
+    series = metrics.snapshot()[0]
+    wire = series['bytes_in'] / ROUNDS
+    ratio = series['compression_ratio']
+    transfer = wire * 8 / (mbit_per_s * 1e6)
+    print(f"  {name:<26} {wire / 1024:8.1f} KiB on the wire   ratio {ratio:5.1f}x"
+          f"   loopback {elapsed * 1000:7.2f} ms   at {mbit_per_s:g} Mbit/s {transfer * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    inbox_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    mbit_per_s = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    server, base_url = start_process(inbox_size=inbox_size, compress=True)
+    try:
+        print(f"Inbox of {inbox_size} emails, {ROUNDS} rounds\n")
+        run("get_emails (identity)", base_url, False, mbit_per_s, lambda c: c.get_emails(ADDRESS))
+        run("get_emails (gzip)", base_url, True, mbit_per_s, lambda c: c.get_emails(ADDRESS))
+    finally:
+        server.terminate()
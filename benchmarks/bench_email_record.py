@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory of Email records vs. plain email dicts.
+
+Parses a synthetic /emails payload and measures the memory retained by
+the resulting dicts, and by the same emails converted to Email records.
+
+Usage:
+    python3 benchmarks/bench_email_record.py [emails] [content_chars]
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleantempmail import Email
+from corpus import make_corpus
+
+
+def payload(count, content_chars):
+    """Serialized /emails response with realistic fields."""
+    emails = []
+    for i, e in enumerate(make_corpus(count)):
+        content = (e["content"] + "\n") * (content_chars // (len(e["content"]) + 1) + 1)
+        emails.append({
+            "id": e["id"],
+            "from_address": f"sender{i % 500}@example.com",
+            "email_address": f"user{i % 100}@cleantempmail.com",
+            "subject": e["subject"],
+            "timestamp": 1700000000 + i,
+            "content": content[:content_chars],
+            "has_html": False,
+        })
+    return json.dumps({"success": True, "data": {"emails": emails}})
+
+
+def retained(build):
+    """Return (object, bytes retained after build(), seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    content_chars = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+    body = payload(count, content_chars)
+    print(f"{count} emails, {content_chars} characters of content each\n")
+    
+    dicts, dict_size, dict_time = retained(lambda: json.loads(body)["data"]["emails"])
+    print(f"  dicts:         {dict_size / 2**20:8.1f} MiB  ({dict_size / count:6.0f} B/email)  build {dict_time:.2f}s")
+    
+    records, record_size, record_time = retained(lambda: [Email.from_dict(e) for e in json.loads(body)["data"]["emails"]])
+    print(f"  Email records: {record_size / 2**20:8.1f} MiB  ({record_size / count:6.0f} B/email)  build {record_time:.2f}s")
+    
+    print(f"\n  memory saved: {1 - record_size / dict_size:.0%}")
+    
+    # Headers only: content is never touched
+    start = time.perf_counter()
+    subjects = sum(1 for r in records if "code" in r["subject"])
+    print(f"  scan subjects of records: {time.perf_counter() - start:.3f}s")
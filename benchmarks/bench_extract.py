@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass code_extractor vs. the previous multi-pattern loop,
+and in-process vs. process-pool batch extraction.
+
+Usage:
+    python3 benchmarks/bench_extract.py [emails]
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_extractor import extract_batch, extract_codes
+from corpus import make_corpus
+
+# The patterns and loop 09_verification_code.py used before code_extractor
+LEGACY_PATTERNS = [
+    r'\b\d{6}\b',
+    r'\b\d{4}\b',
+    r'\b[A-Z0-9]{8}\b',
+    r'code[:\s]+([A-Z0-9-]{4,})',
+    r'verification[:\s]+([A-Z0-9-]{4,})',
+]
+
+
+def legacy_extract_codes(text):
+    codes = []
+    for pattern in LEGACY_PATTERNS:
+        codes.extend(re.findall(pattern, text, re.IGNORECASE))
+    unique_codes = []
+    seen = set()
+    for code in codes:
+        code = code.strip()
+        if code and code not in seen:
+            seen.add(code)
+            unique_codes.append(code)
+    return unique_codes
+
+
+def run(extract, texts):
+    start = time.perf_counter()
+    found = 0
+    for text in texts:
+        if extract(text):
+            found += 1
+    return time.perf_counter() - start, found
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    emails = make_corpus(count)
+    texts = [f"{e['subject']} {e['content']}" for e in emails]
+    print(f"{count} synthetic emails\n")
+    
+    legacy_time, legacy_found = run(legacy_extract_codes, texts)
+    print(f"  legacy (5 patterns): {count / legacy_time:10.0f} emails/s  ({legacy_found} with candidates)")
+    
+    new_time, new_found = run(extract_codes, texts)
+    print(f"  code_extractor:      {count / new_time:10.0f} emails/s  ({new_found} with candidates)")
+    
+    print(f"\n  speedup: {legacy_time / new_time:.2f}x")
+    
+    print(f"\n  extract_batch on {count} emails:")
+    start = time.perf_counter()
+    extract_batch(emails, max_workers=1)
+    serial_time = time.perf_counter() - start
+    print(f"    in-process:   {count / serial_time:10.0f} emails/s")
+    
+    start = time.perf_counter()
+    extract_batch(emails, min_pool_batch=0)
+    pool_time = time.perf_counter() - start
+    print(f"    process pool: {count / pool_time:10.0f} emails/s  ({os.cpu_count()} CPUs)")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: client overhead of request hooks and the metrics collector.
+
+Requests are answered by an in-memory pool returning a canned /stats
+response, so the numbers show only the client's own work per call: a
+bare _send() (no hook dispatch at all), _make_request() with no hooks,
+with no-op hooks on every event, and with a MetricsCollector installed.
+
+Usage:
+    python3 benchmarks/bench_hooks.py [calls]
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleantempmail import CleanTempMailClient, MetricsCollector, Response
+
+BODY = json.dumps({"success": True, "data": {
+    "total_emails": 123456, "unique_subjects": 4321, "active_domains": 12,
+}}).encode("utf-8")
+
+
+class CannedPool:
+    """Stands in for ConnectionPool without any I/O."""
+    
+    def request(self, method, url, body=None, headers=None):
+        return Response(200, "OK", {}, BODY)
+    
+    def close(self):
+        pass
+
+
+def run(name, call, calls, baseline=None):
+    for _ in range(1000):
+        call()
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    per_call = (time.perf_counter() - start) / calls * 1e6
+    overhead = f"  {per_call - baseline:+6.2f} µs" if baseline is not None else ""
+    print(f"  {name:<22} {per_call:6.2f} µs/call{overhead}")
+    return per_call
+
+
+def noop(event):
+    pass
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"{calls} calls per case\n")
+    
+    client = CleanTempMailClient("ct-test", pool=CannedPool(), conditional=False)
+    headers = {"X-API-Key": "ct-test", "Content-Type": "application/json"}
+    url = f"{client.base_url}/stats"
+    base = run("bare _send", lambda: client._send("/stats", url, "GET", None, dict(headers)), calls)
+    run("no hooks", lambda: client._make_request("/stats"), calls, base)
+    
+    for event in ("before_request", "after_response", "on_error"):
+        client.add_hook(event, noop)
+    run("no-op hooks", lambda: client._make_request("/stats"), calls, base)
+    for event in ("before_request", "after_response", "on_error"):
+        client.remove_hook(event, noop)
+    
+    metrics = MetricsCollector().install(client)
+    run("MetricsCollector", lambda: client._make_request("/stats"), calls, base)
+    print(f"\n  recorded {metrics.snapshot()[0]['requests']} requests")
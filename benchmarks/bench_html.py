@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark: code extraction on raw HTML vs. HTML converted to text first.
+
+Measures throughput and how often the best candidate is the code a reader
+would see (HTML bodies carry hex colors and tracking ids that look like codes).
+
+Usage:
+    python3 benchmarks/bench_html.py [emails]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from code_extractor import extract_candidates
+from corpus import make_corpus, make_html_corpus
+from html_text import email_text
+
+
+def timed(func, items):
+    start = time.perf_counter()
+    results = [func(item) for item in items]
+    return time.perf_counter() - start, results
+
+
+def score(emails, candidate_lists):
+    """Return (best code right, emails whose best candidate is not their code)."""
+    correct = wrong = 0
+    for email, candidates in zip(emails, candidate_lists):
+        best = candidates[0].code if candidates else None
+        correct += best is not None and best == email['code']
+        wrong += best not in (None, email['code'])
+    return correct, wrong
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    emails = make_html_corpus(count)
+    with_code = sum(e['code'] is not None for e in emails)
+    print(f"{count} synthetic HTML emails ({with_code} with a verification code)\n")
+    
+    def report(name, elapsed, candidate_lists):
+        correct, wrong = score(emails, candidate_lists)
+        print(f"  {name:<26} {count / elapsed:9.0f} emails/s  "
+              f"best code right: {correct / with_code:6.1%}  wrong best code: {wrong}")
+    
+    plain = [f"{e['subject']} {e['content']}" for e in make_corpus(count)]
+    report("plain text (reference)", *timed(extract_candidates, plain))
+    
+    raw = [f"{e['subject']} {e['content']}" for e in emails]
+    report("raw HTML", *timed(extract_candidates, raw))
+    
+    convert_time, texts = timed(email_text, emails)
+    extract_time, candidate_lists = timed(extract_candidates, texts)
+    report("html_to_text, extract only", extract_time, candidate_lists)
+    report("html_to_text + extract", convert_time + extract_time, candidate_lists)
+    print(f"\n  html_to_text alone: {count / convert_time:9.0f} emails/s, "
+          f"{sum(map(len, raw)) / sum(map(len, texts)):.1f}x less text to scan")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FTS5 search in InboxMirror vs. scanning emails in Python.
+
+Loads N synthetic emails (spread over 1000 addresses) into a mirror,
+then times a few searches (newest matches, best-ranked matches, and
+matches in one inbox) against a substring scan of the same emails held
+in memory, which is what searching via get_emails amounts to.
+
+Usage:
+    python3 benchmarks/bench_mirror.py [emails]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import make_corpus
+from inbox_mirror import InboxMirror
+
+ADDRESSES = 1000
+QUERIES = ("shipped", "verification code", "unsubscribe privacy", "4711")
+
+
+def scan(emails, query):
+    words = query.lower().split()
+    return [e for e in emails
+            if all(w in e["subject"].lower() or w in e["content"].lower() for w in words)]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    emails = make_corpus(count)
+    for i, e in enumerate(emails):
+        e["from_address"] = f"sender{i % 500}@example.com"
+        e["timestamp"] = 1700000000 + i
+    
+    path = os.path.join(tempfile.mkdtemp(), "mirror.db")
+    with InboxMirror(None, path) as mirror:
+        start = time.perf_counter()
+        for a in range(ADDRESSES):
+            mirror.store(f"user{a}@cleantempmail.com", emails[a::ADDRESSES])
+        load = time.perf_counter() - start
+        print(f"{count:,} emails in {ADDRESSES} inboxes, loaded in {load:.1f}s "
+              f"({count / load:,.0f} emails/s, {os.path.getsize(path) / 2**20:.0f} MiB)\n")
+        
+        for query in QUERIES:
+            start = time.perf_counter()
+            mirror.search(query, limit=50)
+            fts = time.perf_counter() - start
+            start = time.perf_counter()
+            mirror.search(query, limit=50, order="rank")
+            fts_rank = time.perf_counter() - start
+            start = time.perf_counter()
+            mirror.search(query, address="user7@cleantempmail.com", limit=50)
+            fts_inbox = time.perf_counter() - start
+            start = time.perf_counter()
+            matches = scan(emails, query)
+            python = time.perf_counter() - start
+            print(f"  {query!r:<22} newest 50 {fts * 1000:7.2f} ms   best 50 {fts_rank * 1000:7.2f} ms"
+                  f"   one inbox {fts_inbox * 1000:6.2f} ms"
+                  f"   Python scan {python * 1000:8.1f} ms ({len(matches):,} matches)")
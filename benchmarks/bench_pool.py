@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keep-alive connection pool vs. a new connection per request.
+
+Runs get_emails against the local stand-in server and reports requests
+per second with the default pool and with keep-alive disabled
+(ConnectionPool(max_size=0)).
+
+Usage:
+    python3 benchmarks/bench_pool.py [requests] [threads]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleantempmail import CleanTempMailClient, ConnectionPool
+from standin_server import StandInServer
+
+
+def run(client, requests, threads):
+    """Issue `requests` get_emails calls on `threads` threads; return req/s."""
+    def worker(count):
+        for _ in range(count):
+            client.get_emails("bench@cleantempmail.com")
+    
+    per_thread = requests // threads
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(worker, per_thread) for _ in range(threads)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+    return per_thread * threads / elapsed
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    
+    server = StandInServer().start()
+    try:
+        print(f"{requests} requests on {threads} thread(s) against {server.base_url}\n")
+        
+        without_pool = CleanTempMailClient("ct-test", server.base_url, pool=ConnectionPool(max_size=0))
+        rate_without = run(without_pool, requests, threads)
+        print(f"  new connection per request: {rate_without:8.0f} req/s")
+        
+        with CleanTempMailClient("ct-test", server.base_url, pool=ConnectionPool(max_size=threads)) as pooled:
+            rate_with = run(pooled, requests, threads)
+        print(f"  keep-alive pool:            {rate_with:8.0f} req/s")
+        
+        print(f"\n  speedup: {rate_with / rate_without:.2f}x")
+    finally:
+        server.stop()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark: get_emails vs. streaming iter_emails / list_headers on a large inbox.
+
+Reports time to the first email, total time and peak traced memory for
+each way of reading the inbox.
+
+Usage:
+    python3 benchmarks/bench_stream.py [inbox_size]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cleantempmail import CleanTempMailClient
+from standin_server import start_process
+
+ADDRESS = "bench@cleantempmail.com"
+
+
+def run(name, read_inbox):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for _ in read_inbox():
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {name:<12} first email {first * 1000:8.2f} ms   all {count} in {total * 1000:8.2f} ms"
+          f"   peak {peak / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    inbox_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    server, base_url = start_process(inbox_size=inbox_size)
+    client = CleanTempMailClient("ct-test", base_url, conditional=False)
+    try:
+        client.get_emails(ADDRESS)  # warm up the connection and server
+        print(f"Inbox of {inbox_size} emails\n")
+        run("get_emails", lambda: client.get_emails(ADDRESS))
+        run("iter_emails", lambda: client.iter_emails(ADDRESS))
+        run("list_headers", lambda: client.list_headers(ADDRESS))
+    finally:
+        client.close()
+        server.terminate()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Synthetic email corpus for extraction benchmarks.
+
+Generates a reproducible mix of verification emails, newsletters without
+any digits, and notifications with unrelated numbers.
+"""
+
+import random
+
+_WORDS = (
+    "hello thanks account please team update news offer welcome about "
+    "your the and for with this that from more today week order service "
+    "support privacy policy unsubscribe view browser settings manage"
+).split()
+
+
+def _filler(rng, words):
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def make_corpus(count, seed=42):
+    """Return `count` synthetic email dicts (id, subject, content)."""
+    rng = random.Random(seed)
+    emails = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.4:
+            code = f"{rng.randint(0, 999999):06d}"
+            subject = "Your verification code"
+            content = f"{_filler(rng, 30)}\nYour code is {code}.\n{_filler(rng, 40)}"
+        elif kind < 0.7:
+            subject = "Weekly newsletter"
+            content = _filler(rng, 90)
+        else:
+            subject = f"Order #{rng.randint(1000, 9999)} shipped"
+            content = (f"{_filler(rng, 40)} Tracking {rng.randint(10**7, 10**8 - 1)} "
+                       f"on {rng.randint(2015, 2025)} {_filler(rng, 40)}")
+        emails.append({"id": f"email-{i}", "subject": subject, "content": content})
+    return emails
+
+
+_HTML_TEMPLATE = """<html><head><style>
+body {{ background: #F4F4F4; color: #333333; }}
+.btn {{ background: #{color}; border: 1px solid #1A2B3C; }}
+.footer {{ color: #{color2}; font-size: 12px; }}
+</style><script>window.track = {{id: "{track}", v: 20240512}};</script></head>
+<body><table width="600"><tr><td><h1>{subject}</h1>
+{body}
+<p class="footer">You received this email from Example&nbsp;Inc &amp; partners.
+<a href="https://t.example.com/c?id={track}">Unsubscribe</a></p>
+<img src="https://t.example.com/o/{pixel}.gif" width="1" height="1"></td></tr></table></body></html>"""
+
+
+def make_html_corpus(count, seed=42):
+    """
+    Return `count` HTML emails built from make_corpus(), with style blocks
+    full of hex colors and tracking ids. Every fifth email leaves out
+    </head>, as HTML allows. Each email's 'code' is the verification code
+    a reader would see (None if there is none).
+    """
+    rng = random.Random(seed + 1)
+    emails = []
+    for email in make_corpus(count, seed):
+        content = email["content"]
+        code = None
+        if email["subject"] == "Your verification code":
+            code = content.split("Your code is ", 1)[1][:6]
+            content = content.replace(f"Your code is {code}.", f"Your code is <b>{code}</b>.")
+        hex_id = lambda: "%08X" % rng.getrandbits(32)
+        html = _HTML_TEMPLATE.format(
+            subject=email["subject"],
+            body="".join(f"<p>{line}</p>\n" for line in content.split("\n")),
+            color=hex_id(), color2="%06X" % rng.getrandbits(24), track=hex_id(), pixel=hex_id(),
+        )
+        if len(emails) % 5 == 4:
+            html = html.replace("</head>", "", 1)
+        emails.append({**email, "content": html, "has_html": True, "code": code})
+    return emails
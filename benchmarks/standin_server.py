@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the CleanTempMail API.
+
+Implements every endpoint used by the client in-process, so benchmarks
+can run offline. Latency, inbox size and error rate are configurable.
+The server speaks HTTP/1.1 and keeps connections alive, like the real
+service, answers If-None-Match with 304 for unchanged responses and,
+when enabled, gzip-compresses responses for clients that accept it.
+
+Usage:
+    python3 benchmarks/standin_server.py [port] [inbox_size] [latency] [error_rate]
+"""
+
+import gzip
+import hashlib
+import json
+import multiprocessing
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_email(index, address="bench@cleantempmail.com"):
+    """Build a fake email object shaped like the API's."""
+    return {
+        "id": f"email-{index}",
+        "from_address": f"sender{index}@example.com",
+        "email_address": address,
+        "subject": f"Your verification code is {100000 + index}",
+        "timestamp": 1700000000 + index,
+        "content": f"Hello,\n\nYour code: {100000 + index}\n\nThanks",
+        "has_html": False,
+    }
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the API."""
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if status == 200 and self.command == "GET" and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if self.server.compress and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body, self.server.compress_level)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+    
+    def _route(self):
+        """Apply latency and injected errors, then dispatch on method and path."""
+        server = self.server
+        body = self._read_body()
+        if server.latency:
+            time.sleep(server.latency)
+        if server.error_rate and server.random() < server.error_rate:
+            self._send_json({"success": False, "error": "Service unavailable"}, status=503)
+            return
+        
+        parts = urllib.parse.urlsplit(self.path)
+        path = parts.path[len("/api"):] if parts.path.startswith("/api") else parts.path
+        query = {k: v[0] for k, v in urllib.parse.parse_qs(parts.query).items()}
+        
+        if self.headers.get("X-API-Key") is None:
+            self._send_json({"success": False, "error": "Missing API key"}, status=401)
+        elif path == "/generate-email" and self.command in ("GET", "POST"):
+            data = json.loads(body) if body else {}
+            self._send_json({"success": True, "data": {"email": server.generate(**data)}})
+        elif path == "/emails" and self.command == "GET":
+            emails = server.inbox(query.get("email", "bench@cleantempmail.com"))
+            self._send_json({"success": True, "data": {"emails": emails}})
+        elif path == "/emails/clear" and self.command == "DELETE":
+            self._send_json({"success": True, "data": {"count": server.inbox_size}})
+        elif path.startswith("/email/") and self.command == "GET":
+            email = dict(make_email(0), id=path[len("/email/"):])
+            self._send_json({"success": True, "data": email})
+        elif path.startswith("/email/") and self.command == "DELETE":
+            self._send_json({"success": True})
+        elif path == "/stats" and self.command == "GET":
+            self._send_json({"success": True, "data": {
+                "total_emails": 123456, "unique_subjects": 4321, "active_domains": 12,
+            }})
+        elif path == "/statistics/24h" and self.command == "GET":
+            self._send_json({"success": True, "data": [
+                {"hour": hour, "count": 100 + hour} for hour in range(24)
+            ]})
+        elif path == "/statistics/top-subjects" and self.command == "GET":
+            self._send_json({"success": True, "data": [
+                {"subject": f"Subject {i}", "count": 1000 - i} for i in range(50)
+            ]})
+        else:
+            self._send_json({"success": False, "error": "Not found"}, status=404)
+    
+    do_GET = _route
+    do_POST = _route
+    do_DELETE = _route
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded stand-in server; use start() / stop() to run it in the background."""
+    
+    daemon_threads = True
+    
+    def __init__(self, host="127.0.0.1", port=0, inbox_size=10, latency=0.0, error_rate=0.0, seed=None,
+                 compress=False, compress_level=6):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            inbox_size: Emails returned by /emails
+            latency: Seconds added to every response
+            error_rate: Fraction of requests answered with HTTP 503
+            seed: Random seed for error injection and generated addresses
+            compress: Gzip responses when the client sends Accept-Encoding: gzip
+            compress_level: Gzip compression level
+        """
+        super().__init__((host, port), StandInHandler)
+        self.inbox_size = inbox_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.compress = compress
+        self.compress_level = compress_level
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._inboxes = {}
+        self._thread = None
+    
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+    
+    def random(self):
+        with self._lock:
+            return self._random.random()
+    
+    def generate(self, prefix=None, domain=None):
+        """Return a new address, like /generate-email."""
+        with self._lock:
+            suffix = self._random.randrange(16 ** 8)
+        return f"{prefix or 'bench'}{suffix:08x}@{domain or 'cleantempmail.com'}"
+    
+    def inbox(self, address):
+        """Return the (cached) inbox listing for an address."""
+        with self._lock:
+            emails = self._inboxes.get(address)
+            if emails is None:
+                emails = self._inboxes[address] = [make_email(i, address) for i in range(self.inbox_size)]
+            return emails
+    
+    def handle_error(self, request, client_address):
+        # Clients may drop a connection mid-response (e.g. breaking out of iter_emails)
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+    
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def _serve(conn, kwargs):
+    server = StandInServer(**kwargs)
+    conn.send(server.base_url)
+    conn.close()
+    server.serve_forever()
+
+
+def start_process(**kwargs):
+    """
+    Run a StandInServer in a child process, so its work does not share the
+    benchmark's GIL or memory tracing. Returns (process, base_url); call
+    process.terminate() when done.
+    """
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_serve, args=(child, kwargs), daemon=True)
+    process.start()
+    base_url = parent.recv()
+    return process, base_url
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    server = StandInServer(
+        port=int(args[0]) if len(args) > 0 else 8080,
+        inbox_size=int(args[1]) if len(args) > 1 else 10,
+        latency=float(args[2]) if len(args) > 2 else 0.0,
+        error_rate=float(args[3]) if len(args) > 3 else 0.0,
+    )
+    print(f"Stand-in API listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -6,31 +6,1585 @@ A reusable Python class for interacting with the CleanTempMail API.
 This module provides a clean, object-oriented interface to all API endpoints.
 """
 
+import base64
+import bisect
+import codecs
+import copy
 import json
-import urllib.request
+import os
+import random
+import re
+import ssl
+import threading
+import time
+import http.client
 import urllib.parse
-from typing import List, Dict, Optional
+import urllib.request
+import zlib
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: file-backed rate limiting is unavailable
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON codec
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # optional: faster JSON codec
+    ujson = None
+
+
+class CleanTempMailError(Exception):
+    """Base class for errors raised by the client."""
+
+
+class TransportError(CleanTempMailError):
+    """The request could not be sent or no response arrived (connection error, timeout)."""
+
+
+class CircuitOpenError(CleanTempMailError):
+    """The endpoint's circuit breaker is open; the request was not sent."""
+
+
+class APIError(CleanTempMailError):
+    """The API answered with an error status or an unsuccessful response."""
+    
+    def __init__(self, message: str, status: Optional[int] = None, reason: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.reason = reason
+
+
+class AuthenticationError(APIError):
+    """Raised on HTTP 401 (invalid API key)."""
+
+
+class ServerError(APIError):
+    """Raised on HTTP 5xx."""
+
+
+class RateLimitError(APIError):
+    """Raised on HTTP 429; retry_after holds the server's Retry-After in seconds, if any."""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None,
+                 status: int = 429, reason: Optional[str] = None):
+        super().__init__(message, status, reason)
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _http_error(status: int, reason: str, headers) -> APIError:
+    """Build the exception raised for an HTTP error status."""
+    error_msg = f"HTTP {status}: {reason}"
+    if status == 401:
+        error_msg += " (Invalid API key)"
+        return AuthenticationError(error_msg, status, reason)
+    elif status == 429:
+        error_msg += " (Rate limit exceeded)"
+        return RateLimitError(error_msg, _parse_retry_after(headers.get('Retry-After')), status, reason)
+    elif status >= 500:
+        return ServerError(error_msg, status, reason)
+    return APIError(error_msg, status, reason)
+
+
+def endpoint_name(endpoint: str) -> str:
+    """Return the endpoint path without query string or email id, e.g. '/email/{id}'."""
+    path = endpoint.split('?', 1)[0]
+    if path.startswith('/email/'):
+        return '/email/{id}'
+    return path
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+    
+    Only idempotent methods are retried, and only after a transport error
+    or one of `retry_statuses`. Delays grow exponentially from `backoff`
+    up to `max_backoff`, with random jitter.
+    """
+    
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+    
+    def __init__(self, max_attempts: int = 3, backoff: float = 0.5, max_backoff: float = 8.0,
+                 retry_statuses: Iterable[int] = (500, 502, 503, 504)):
+        """
+        Initialize the policy.
+        
+        Args:
+            max_attempts: Total attempts per request, including the first (1 disables retries)
+            backoff: Delay before the first retry in seconds
+            max_backoff: Longest delay between attempts in seconds
+            retry_statuses: HTTP statuses that are worth retrying
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+    
+    def should_retry(self, method: str, error: Exception, attempt: int) -> bool:
+        """Whether attempt number `attempt`, which raised error, should be retried."""
+        if attempt >= self.max_attempts or method.upper() not in self.IDEMPOTENT_METHODS:
+            return False
+        if isinstance(error, TransportError):
+            return True
+        return isinstance(error, APIError) and error.status in self.retry_statuses
+    
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after attempt number `attempt` failed."""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breakers.
+    
+    After `failure_threshold` consecutive failures (transport errors or
+    HTTP 5xx) an endpoint's circuit opens and requests to it fail fast with
+    CircuitOpenError. After `recovery_timeout` seconds it becomes half-open
+    and lets up to `half_open_max_calls` probe requests through: a success
+    closes the circuit, a failure opens it again.
+    
+    One breaker can be shared by several clients; state() / states() let
+    schedulers shed load while an endpoint is down.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        """
+        Initialize the breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open a circuit
+            recovery_timeout: Seconds a circuit stays open before probing
+            half_open_max_calls: Probe requests allowed at once while half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        # endpoint -> [state, consecutive failures, opened at, probes in flight]
+        self._circuits = {}
+        self._lock = threading.Lock()
+    
+    def _circuit(self, endpoint: str) -> list:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = self._circuits[endpoint] = [self.CLOSED, 0, 0.0, 0]
+        if circuit[0] == self.OPEN and time.monotonic() - circuit[2] >= self.recovery_timeout:
+            circuit[0] = self.HALF_OPEN
+            circuit[3] = 0
+        return circuit
+    
+    def before(self, endpoint: str):
+        """
+        Reserve permission to call endpoint.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open or its probe slots are taken
+        """
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            if circuit[0] == self.CLOSED:
+                return
+            if circuit[0] == self.HALF_OPEN and circuit[3] < self.half_open_max_calls:
+                circuit[3] += 1
+                return
+            retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - circuit[2]))
+        raise CircuitOpenError(f"Circuit open for {endpoint} (retry in {retry_in:.1f}s)")
+    
+    def success(self, endpoint: str):
+        """Record a call that reached a healthy endpoint."""
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit[0] = self.CLOSED
+            circuit[1] = 0
+            circuit[3] = 0
+    
+    def failure(self, endpoint: str):
+        """Record a failed call (transport error or HTTP 5xx)."""
+        with self._lock:
+            circuit = self._circuit(endpoint)
+            circuit[1] += 1
+            if circuit[0] == self.HALF_OPEN or circuit[1] >= self.failure_threshold:
+                circuit[0] = self.OPEN
+                circuit[2] = time.monotonic()
+                circuit[3] = 0
+    
+    def state(self, endpoint: str) -> str:
+        """Return 'closed', 'open' or 'half_open' for an endpoint (see endpoint_name)."""
+        with self._lock:
+            return self._circuit(endpoint)[0]
+    
+    def states(self) -> Dict[str, str]:
+        """Return the state of every endpoint seen so far."""
+        with self._lock:
+            return {endpoint: self._circuit(endpoint)[0] for endpoint in list(self._circuits)}
+
+
+class RequestEvent:
+    """
+    One request attempt, as seen by client hooks.
+    
+    before_request hooks get the event before the request is sent (and may
+    add to `headers`); after_response or on_error hooks get it once the
+    attempt has finished, with the status, sizes and elapsed time filled in.
+    `bytes_in` counts the response body as received and `bytes_decoded`
+    after decompression.
+    """
+    
+    __slots__ = ('method', 'endpoint', 'attempt', 'headers', 'status', 'bytes_out', 'bytes_in',
+                 'bytes_decoded', 'elapsed', 'error')
+    
+    def __init__(self, method: str, endpoint: str, attempt: int, headers: Dict, bytes_out: int):
+        self.method = method
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.headers = headers
+        self.status = None
+        self.bytes_out = bytes_out
+        self.bytes_in = 0
+        self.bytes_decoded = 0
+        self.elapsed = 0.0
+        self.error = None
+    
+    @property
+    def name(self) -> str:
+        """Endpoint name used for grouping, e.g. '/email/{id}'."""
+        return endpoint_name(self.endpoint)
+
+
+class MetricsCollector:
+    """
+    Per-endpoint request metrics, collected through client hooks.
+    
+    Counts requests by status, errors by exception type, bytes sent and
+    received (and the compression ratio of responses), and keeps a
+    latency histogram for every (method, endpoint). Metrics can be
+    exported as Prometheus text exposition or JSON. One collector may be
+    installed on several clients.
+    """
+    
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS, prefix: str = 'cleantempmail'):
+        """
+        Initialize the collector.
+        
+        Args:
+            buckets: Upper bounds of the latency histogram buckets, in seconds
+            prefix: Prefix of the exported metric names
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._series = {}
+        self._lock = threading.Lock()
+    
+    def install(self, client: "CleanTempMailClient") -> "MetricsCollector":
+        """Register the collector's hooks on client."""
+        client.add_hook('after_response', self.record)
+        client.add_hook('on_error', self.record)
+        return self
+    
+    def _entry(self, key) -> Dict:
+        entry = self._series.get(key)
+        if entry is None:
+            entry = self._series[key] = {
+                'requests': 0,
+                'statuses': {},
+                'errors': {},
+                'bytes_out': 0,
+                'bytes_in': 0,
+                'bytes_decoded': 0,
+                'latency_buckets': [0] * len(self.buckets),
+                'latency_sum': 0.0,
+            }
+        return entry
+    
+    def record(self, event: RequestEvent):
+        """Hook: add a finished request attempt to the metrics."""
+        key = (event.method, event.name)
+        index = bisect.bisect_left(self.buckets, event.elapsed)
+        with self._lock:
+            entry = self._entry(key)
+            entry['requests'] += 1
+            if event.status is not None:
+                entry['statuses'][event.status] = entry['statuses'].get(event.status, 0) + 1
+            if event.error is not None:
+                error = type(event.error).__name__
+                entry['errors'][error] = entry['errors'].get(error, 0) + 1
+            entry['bytes_out'] += event.bytes_out
+            entry['bytes_in'] += event.bytes_in
+            entry['bytes_decoded'] += event.bytes_decoded
+            if index < len(self.buckets):
+                entry['latency_buckets'][index] += 1
+            entry['latency_sum'] += event.elapsed
+    
+    def snapshot(self) -> List[Dict]:
+        """Return a copy of the metrics, one dict per (method, endpoint)."""
+        with self._lock:
+            series = [
+                dict(entry, method=method, endpoint=name, statuses=dict(entry['statuses']),
+                     errors=dict(entry['errors']), latency_buckets=list(entry['latency_buckets']))
+                for (method, name), entry in sorted(self._series.items())
+            ]
+        for entry in series:
+            entry['compression_ratio'] = entry['bytes_decoded'] / entry['bytes_in'] if entry['bytes_in'] else 1.0
+            # Cumulative counts, as in Prometheus histograms
+            total = 0
+            cumulative = []
+            for count in entry['latency_buckets']:
+                total += count
+                cumulative.append(total)
+            entry['latency_buckets'] = dict(zip(self.buckets, cumulative))
+        return series
+    
+    def to_json(self) -> str:
+        """Return the metrics as a JSON document."""
+        return json.dumps({'buckets': list(self.buckets), 'endpoints': self.snapshot()})
+    
+    def to_prometheus(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        p = self.prefix
+        series = self.snapshot()
+        lines = []
+        
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+        
+        def labels(entry, **extra):
+            pairs = [('method', entry['method']), ('endpoint', entry['endpoint'])] + list(extra.items())
+            return ','.join('%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+                            for k, v in pairs)
+        
+        family('requests_total', 'counter', 'Request attempts by response status.')
+        for entry in series:
+            for status, count in sorted(entry['statuses'].items()):
+                lines.append(f"{p}_requests_total{{{labels(entry, status=status)}}} {count}")
+        family('request_errors_total', 'counter', 'Failed request attempts by error type.')
+        for entry in series:
+            for error, count in sorted(entry['errors'].items()):
+                lines.append(f"{p}_request_errors_total{{{labels(entry, error=error)}}} {count}")
+        family('request_bytes_total', 'counter', 'Request body bytes sent.')
+        for entry in series:
+            lines.append(f"{p}_request_bytes_total{{{labels(entry)}}} {entry['bytes_out']}")
+        family('response_bytes_total', 'counter', 'Response body bytes received.')
+        for entry in series:
+            lines.append(f"{p}_response_bytes_total{{{labels(entry)}}} {entry['bytes_in']}")
+        family('response_decoded_bytes_total', 'counter', 'Response body bytes after decompression.')
+        for entry in series:
+            lines.append(f"{p}_response_decoded_bytes_total{{{labels(entry)}}} {entry['bytes_decoded']}")
+        family('response_compression_ratio', 'gauge', 'Decoded bytes per received byte.')
+        for entry in series:
+            lines.append(f"{p}_response_compression_ratio{{{labels(entry)}}} {entry['compression_ratio']:.3f}")
+        family('request_duration_seconds', 'histogram', 'Request attempt latency.')
+        for entry in series:
+            for bound, count in entry['latency_buckets'].items():
+                lines.append(f"{p}_request_duration_seconds_bucket{{{labels(entry, le=bound)}}} {count}")
+            lines.append(f"{p}_request_duration_seconds_bucket{{{labels(entry, le='+Inf')}}} {entry['requests']}")
+            lines.append(f"{p}_request_duration_seconds_sum{{{labels(entry)}}} {entry['latency_sum']}")
+            lines.append(f"{p}_request_duration_seconds_count{{{labels(entry)}}} {entry['requests']}")
+        return '\n'.join(lines) + '\n'
+    
+    def reset(self):
+        """Forget all collected metrics."""
+        with self._lock:
+            self._series.clear()
+
+
+class PollingStrategy:
+    """
+    Decides how long to wait between inbox polls.
+    
+    Subclasses implement next_delay(); reset() is called at the start of
+    every wait so one strategy object can be reused for several waits
+    (but not by several concurrent waits).
+    """
+    
+    def reset(self):
+        """Return to the initial polling rate."""
+    
+    def next_delay(self, found_new: bool) -> float:
+        """
+        Seconds to wait before the next poll.
+        
+        Args:
+            found_new: Whether the last poll returned new emails
+        """
+        raise NotImplementedError
+
+
+class FixedInterval(PollingStrategy):
+    """Poll at a constant interval."""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+    
+    def next_delay(self, found_new: bool) -> float:
+        return self.interval
+
+
+class ExponentialBackoff(PollingStrategy):
+    """
+    Poll quickly at first and back off exponentially while the inbox is idle.
+    
+    The delay starts at `initial`, is multiplied by `multiplier` after every
+    empty poll up to `maximum`, and drops back to `initial` as soon as a
+    poll finds new mail. Each delay is shortened by a random fraction of up
+    to `jitter` so many pollers do not fire in lockstep.
+    """
+    
+    def __init__(self, initial: float = 0.5, maximum: float = 30.0,
+                 multiplier: float = 2.0, jitter: float = 0.2):
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._current = initial
+    
+    def reset(self):
+        self._current = self.initial
+    
+    def next_delay(self, found_new: bool) -> float:
+        if found_new:
+            self.reset()
+        delay = self._current
+        self._current = min(self._current * self.multiplier, self.maximum)
+        if self.jitter:
+            delay *= 1 - self.jitter * random.random()
+        return delay
+
+
+class JSONCodec:
+    """
+    Encodes request bodies and decodes response bodies with the stdlib json module.
+    
+    Codecs work on bytes in both directions, so response bodies are parsed
+    without first being decoded into a str copy.
+    """
+    
+    name = 'json'
+    
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+    
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec backed by orjson (pip install orjson)."""
+    
+    name = 'orjson'
+    
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson: pip install orjson")
+    
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+    
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+class UjsonCodec(JSONCodec):
+    """JSON codec backed by ujson (pip install ujson)."""
+    
+    name = 'ujson'
+    
+    def __init__(self):
+        if ujson is None:
+            raise ImportError("UjsonCodec requires ujson: pip install ujson")
+    
+    def loads(self, data: bytes) -> Any:
+        return ujson.loads(data)
+    
+    def dumps(self, obj: Any) -> bytes:
+        return ujson.dumps(obj).encode('utf-8')
+
+
+def default_codec() -> JSONCodec:
+    """Return the fastest installed codec: orjson, then ujson, then the stdlib."""
+    if orjson is not None:
+        return OrjsonCodec()
+    if ujson is not None:
+        return UjsonCodec()
+    return JSONCodec()
+
+
+# Content codings the client accepts
+ACCEPT_ENCODING = 'gzip, deflate'
+
+
+def _decompressor(encoding: Optional[str]):
+    """Return a zlib decompressor for a Content-Encoding, or None if the body is not encoded."""
+    encoding = (encoding or '').strip().lower()
+    if encoding in ('', 'identity'):
+        return None
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        # zlib-wrapped deflate (RFC 9110); +32 also accepts a gzip header
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    raise CleanTempMailError(f"Unsupported Content-Encoding: {encoding}")
+
+
+def _decode_body(body: bytes, encoding: Optional[str]) -> bytes:
+    """Decompress a complete response body."""
+    decompressor = _decompressor(encoding)
+    if decompressor is None or not body:
+        return body
+    return decompressor.decompress(body) + decompressor.flush()
+
+
+class _DecompressingReader:
+    """Wraps a read(amount) function and returns the decompressed body."""
+    
+    def __init__(self, read: Callable[[int], bytes], decompressor):
+        self._read = read
+        self._decompressor = decompressor
+    
+    def read(self, amount: int) -> bytes:
+        # Only return b'' at the end of the body
+        while True:
+            chunk = self._read(amount)
+            if not chunk:
+                return self._decompressor.flush()
+            data = self._decompressor.decompress(chunk)
+            if data:
+                return data
+
+
+# Marks the end of an iterator where None is a valid item
+_END = object()
+
+
+class _CountingReader:
+    """Wraps a read(amount) function and adds the bytes it returns to a RequestEvent field."""
+    
+    def __init__(self, read: Callable[[int], bytes], event: RequestEvent, field: str):
+        self._read = read
+        self._event = event
+        self._field = field
+    
+    def read(self, amount: int) -> bytes:
+        data = self._read(amount)
+        setattr(self._event, self._field, getattr(self._event, self._field) + len(data))
+        return data
+
+
+class Response:
+    """A fully read HTTP response returned by ConnectionPool."""
+    
+    def __init__(self, status: int, reason: str, headers: http.client.HTTPMessage, body: bytes):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+
+class StreamingResponse:
+    """An HTTP response whose body is read incrementally (see ConnectionPool.stream)."""
+    
+    def __init__(self, pool: "ConnectionPool", key, conn, response: http.client.HTTPResponse):
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+        self._pool = pool
+        self._key = key
+        self._conn = conn
+        self._response = response
+    
+    def read(self, amount: Optional[int] = None) -> bytes:
+        """Read up to amount bytes of the body (all of it if amount is None)."""
+        return self._response.read(amount)
+    
+    def close(self):
+        """Release the connection: back to the pool if the body was fully read."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool._finish(self._key, conn, self._response)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTP connections.
+    
+    Idle connections are kept per (scheme, host, port) and reused by later
+    requests, so repeated API calls skip the TCP connect and TLS handshake.
+    A connection is only ever used by one thread at a time; it is checked
+    out for the duration of a request and returned afterwards.
+    """
+    
+    def __init__(self, max_size: int = 10, idle_timeout: float = 60.0, timeout: float = 30.0,
+                 proxies: Optional[Dict[str, str]] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            max_size: Maximum idle connections kept per host (0 disables keep-alive)
+            idle_timeout: Seconds an idle connection may be kept before it is discarded
+            timeout: Socket timeout in seconds for new connections
+            proxies: Proxy URL per scheme, e.g. {'https': 'http://proxy:3128'}
+                (default: HTTP_PROXY / HTTPS_PROXY / NO_PROXY, like urllib)
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._env_proxies = proxies is None
+        self.proxies = urllib.request.getproxies() if proxies is None else proxies
+        self._proxy_routes = {}
+        self._ssl_context = ssl.create_default_context()
+        self._idle = {}
+        self._lock = threading.Lock()
+    
+    def _proxy_for(self, key):
+        """Return (proxy host, proxy port, proxy headers) for key, or None to connect directly."""
+        try:
+            return self._proxy_routes[key]
+        except KeyError:
+            pass
+        scheme, host, _ = key
+        route = None
+        proxy = self.proxies.get(scheme)
+        if proxy and not (self._env_proxies and urllib.request.proxy_bypass(host)):
+            parts = urllib.parse.urlsplit(proxy if '://' in proxy else 'http://' + proxy)
+            headers = {}
+            if parts.username:
+                credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+                headers['Proxy-Authorization'] = 'Basic ' + base64.b64encode(credentials.encode()).decode('ascii')
+            route = (parts.hostname, parts.port or 80, headers)
+        self._proxy_routes[key] = route
+        return route
+    
+    def _new_connection(self, key):
+        scheme, host, port = key
+        proxy = self._proxy_for(key)
+        if proxy is None:
+            if scheme == 'https':
+                return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl_context)
+            return http.client.HTTPConnection(host, port, timeout=self.timeout)
+        proxy_host, proxy_port, proxy_headers = proxy
+        if scheme == 'https':
+            # TLS to the API host through a CONNECT tunnel
+            conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=self.timeout, context=self._ssl_context)
+            conn.set_tunnel(host, port, headers=proxy_headers)
+            return conn
+        return http.client.HTTPConnection(proxy_host, proxy_port, timeout=self.timeout)
+    
+    def _acquire(self, key):
+        """Return an idle connection for key (and whether it was reused)."""
+        now = time.monotonic()
+        expired = []
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate, last_used = idle.pop()
+                if now - last_used > self.idle_timeout:
+                    expired.append(candidate)
+                else:
+                    conn = candidate
+                    break
+            # Anything left below an expired entry is older still
+            if idle and expired:
+                expired.extend(c for c, _ in idle)
+                idle.clear()
+        for stale in expired:
+            stale.close()
+        if conn is not None:
+            return conn, True
+        return self._new_connection(key), False
+    
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if len(idle) < self.max_size:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+    
+    def _send(self, method: str, url: str, body: Optional[bytes], headers: Optional[Dict]):
+        """Send a request and return (key, connection, unread http.client response)."""
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        if scheme == 'http':
+            proxy = self._proxy_for(key)
+            if proxy is not None:
+                # Plain HTTP proxies take the absolute URL
+                path = f"{scheme}://{parts.netloc}{path}"
+                headers = {**(headers or {}), **proxy[2]}
+        
+        conn, reused = self._acquire(key)
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; retry once on a fresh one
+            conn = self._new_connection(key)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+        return key, conn, response
+    
+    def _finish(self, key, conn, response):
+        """Return conn to the pool if its response was fully read, else close it."""
+        if response.isclosed() and not response.will_close:
+            self._release(key, conn)
+        else:
+            conn.close()
+    
+    def request(self, method: str, url: str, body: Optional[bytes] = None,
+                headers: Optional[Dict] = None) -> Response:
+        """
+        Send a request and read the whole response.
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            body: Request body (optional)
+            headers: Request headers (optional)
+        
+        Returns:
+            Response: Status, reason, headers and body of the response
+        """
+        key, conn, response = self._send(method, url, body, headers)
+        try:
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+        self._finish(key, conn, response)
+        return Response(response.status, response.reason, response.headers, data)
+    
+    def stream(self, method: str, url: str, body: Optional[bytes] = None,
+               headers: Optional[Dict] = None) -> "StreamingResponse":
+        """
+        Send a request and return the response without reading its body.
+        
+        The caller reads the body from the returned StreamingResponse and
+        must close it (or use it as a context manager). The connection is
+        reused only if the body was read to the end.
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            body: Request body (optional)
+            headers: Request headers (optional)
+        
+        Returns:
+            StreamingResponse: Open response
+        """
+        key, conn, response = self._send(method, url, body, headers)
+        return StreamingResponse(self, key, conn, response)
+    
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn, _ in connections:
+                conn.close()
+
+
+class ConditionalCache:
+    """
+    Validators and parsed responses for conditional GET requests.
+    
+    Remembers the ETag / Last-Modified of recent GET responses (bounded by
+    entry count and total body size, least recently used entries are
+    evicted) so the next request for the same URL can be sent with
+    If-None-Match / If-Modified-Since. When the server answers 304 Not
+    Modified the previously received body is parsed again (so every caller
+    gets its own result to modify), and the bytes that were not transferred
+    are counted.
+    """
+    
+    def __init__(self, max_entries: int = 256, max_bytes: int = 4 * 1024 * 1024):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of URLs to keep validators for
+            max_bytes: Maximum total size of the kept (decoded) bodies;
+                larger bodies are not cached at all
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def request_headers(self, url: str) -> Tuple[Dict, Optional[tuple]]:
+        """
+        Return the conditional headers to send for url and the entry they came from.
+        
+        Pass the entry to not_modified_body() when the answer is 304, so the
+        response is served from it even if the URL was evicted meanwhile.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return {}, None
+        etag, last_modified = entry[0], entry[1]
+        if etag:
+            return {"If-None-Match": etag}, entry
+        return {"If-Modified-Since": last_modified}, entry
+    
+    def _drop(self, url: str):
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self._size -= len(entry[2])
+    
+    def store(self, url: str, headers, body: bytes, wire_size: int):
+        """Remember a 200 response body (decoded) if it carries a validator."""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            self._drop(url)
+            if (not etag and not last_modified) or len(body) > self.max_bytes:
+                return
+            self._entries[url] = (etag, last_modified, body, wire_size)
+            self._size += len(body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (_, _, evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+    
+    def not_modified_body(self, url: str, entry: Optional[tuple]) -> bytes:
+        """Return the body of entry (from request_headers) for a 304 response and count the savings."""
+        if entry is None:
+            raise CleanTempMailError(f"HTTP 304 for {url} without a cached response")
+        with self._lock:
+            if self._entries.get(url) is entry:
+                self._entries.move_to_end(url)
+            self.not_modified += 1
+            self.bytes_saved += entry[3]
+        return entry[2]
+    
+    def stats(self) -> Dict:
+        """Return counters for 304 responses and the work they saved."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'not_modified': self.not_modified,
+                'bytes_saved': self.bytes_saved,
+            }
+
+
+class RateLimiter:
+    """
+    Client-side token bucket that makes requests wait instead of hitting HTTP 429.
+    
+    Tokens refill at `rate` per second up to `burst`. Each request takes
+    tokens equal to its endpoint's weight, and waits until enough are
+    available. By default the bucket lives in memory and is shared by all
+    threads using the limiter; with `path` its state is kept in a locked
+    file so several worker processes on one machine share one budget.
+    """
+    
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 weights: Optional[Dict[str, float]] = None, path: Optional[str] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            rate: Tokens added per second (sustained requests per second at weight 1)
+            burst: Bucket size (default: rate, minimum 1)
+            weights: Tokens per request by endpoint path, e.g. {'/emails': 2, '/email': 1}
+            path: State file shared between processes (optional, POSIX only)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.weights = dict(weights or {})
+        heaviest = max(self.weights.values(), default=1.0)
+        if heaviest > self.burst:
+            raise ValueError(f"burst ({self.burst}) is smaller than the largest weight ({heaviest})")
+        if path is not None and fcntl is None:
+            raise RuntimeError("File-backed rate limiting requires fcntl (POSIX)")
+        self.path = path
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def weight(self, endpoint: str) -> float:
+        """Return the token cost of a request to endpoint."""
+        path = endpoint.split('?', 1)[0]
+        if path in self.weights:
+            return self.weights[path]
+        # '/email/<id>' is weighted as '/email'
+        return self.weights.get('/' + path.lstrip('/').split('/', 1)[0], 1.0)
+    
+    def _refill_and_take(self, tokens: float, updated: float, now: float, cost: float):
+        """Return (tokens, seconds to wait) after trying to take cost."""
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= cost:
+            return tokens - cost, 0.0
+        return tokens, (cost - tokens) / self.rate
+    
+    def _take(self, cost: float) -> float:
+        if self.path is None:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens, wait = self._refill_and_take(self._tokens, self._updated, now, cost)
+                self._updated = now
+                return wait
+        
+        # Opened per call so forked processes never share one lock
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            try:
+                tokens, updated = (float(x) for x in os.read(fd, 64).split())
+            except ValueError:
+                tokens, updated = self.burst, now
+            tokens, wait = self._refill_and_take(tokens, updated, now, cost)
+            state = f"{tokens!r} {now!r}".encode()
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, state)
+            return wait
+        finally:
+            os.close(fd)
+    
+    def acquire(self, endpoint: str = '') -> float:
+        """
+        Block until a request to endpoint may be sent.
+        
+        Args:
+            endpoint: API endpoint (used to look up its weight)
+        
+        Returns:
+            float: Seconds spent waiting
+        """
+        cost = self.weight(endpoint)
+        waited = 0.0
+        while True:
+            wait = self._take(cost)
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class _Flight:
+    """A fetch in progress that concurrent cache misses can wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.data = None
+        self.error = None
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL cache with LRU eviction for slowly changing responses.
+    
+    Each key (an endpoint path) has its own time-to-live. When several
+    threads miss on the same key at once, only one of them fetches and
+    the others wait for its result, so an expiring entry does not cause a
+    burst of identical requests. Values are kept encoded and decoded for
+    every caller, so modifying a result never changes what others see.
+    """
+    
+    DEFAULT_TTLS = {
+        '/stats': 30.0,
+        '/statistics/24h': 300.0,
+        '/statistics/top-subjects': 300.0,
+    }
+    
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 60.0,
+                 max_entries: int = 128, codec: Optional[JSONCodec] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttls: Seconds to keep responses, per endpoint (merged over DEFAULT_TTLS)
+            default_ttl: Seconds to keep responses for other endpoints
+            max_entries: Maximum number of cached responses
+            codec: JSON codec the values are stored with (default: default_codec())
+        """
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.codec = codec if codec is not None else default_codec()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+    
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any],
+                     cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Return the cached value for key, calling fetch() on a miss.
+        
+        Args:
+            key: Cache key (endpoint path)
+            fetch: Function producing a JSON-serializable value
+            cacheable: Predicate deciding whether a fetched value is stored (optional;
+                a predicate that raises counts as False)
+        
+        Returns:
+            A fresh copy of the cached or fetched value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, data = entry
+                if time.monotonic() < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self.codec.loads(data)
+                del self._entries[key]
+            
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = self._inflight[key] = _Flight()
+                leader = True
+                self.misses += 1
+            else:
+                leader = False
+                self.coalesced += 1
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return self.codec.loads(flight.data)
+        
+        store = False
+        try:
+            try:
+                value = fetch()
+                flight.data = self.codec.dumps(value)
+            except BaseException as e:
+                # Waiters get an Exception even if the fetch was interrupted
+                flight.error = e if isinstance(e, Exception) else CleanTempMailError(f"Fetch of {key} did not complete")
+                raise
+            try:
+                store = cacheable is None or bool(cacheable(value))
+            except Exception:
+                pass  # e.g. an unexpected response shape: just don't keep it
+        finally:
+            try:
+                with self._lock:
+                    del self._inflight[key]
+                    if store:
+                        ttl = self.ttls.get(key, self.default_ttl)
+                        self._entries[key] = (time.monotonic() + ttl, flight.data)
+                        self._entries.move_to_end(key)
+                        while len(self._entries) > self.max_entries:
+                            self._entries.popitem(last=False)
+            finally:
+                flight.done.set()
+        # The fetched value was never shared, so the leader can keep it
+        return value
+    
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one cached key, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+    
+    def stats(self) -> Dict:
+        """Return hit / miss counters (coalesced = misses that shared another fetch)."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+            }
+
+
+class BodyCache:
+    """
+    Thread-safe LRU cache of full emails, keyed by email ID.
+    
+    An email never changes once received, so entries need no expiry; the
+    least recently used ones are evicted when the cache is full. Emails
+    are kept encoded and decoded for every caller, so modifying one never
+    changes what others see.
+    """
+    
+    def __init__(self, max_entries: int = 1024, codec: Optional[JSONCodec] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of emails to keep
+            codec: JSON codec the emails are stored with (default: default_codec())
+        """
+        self.max_entries = max_entries
+        self.codec = codec if codec is not None else default_codec()
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, email_id: str) -> Optional[Dict]:
+        """Return a fresh copy of the cached email, or None."""
+        with self._lock:
+            entry = self._entries.get(email_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email_id)
+            self.hits += 1
+        return self.codec.loads(entry[1])
+    
+    def put(self, email_id: str, email: Dict):
+        """Store (an encoded copy of) an email, evicting the least recently used if full."""
+        entry = (email.get('email_address'), self.codec.dumps(email))
+        with self._lock:
+            self._entries[email_id] = entry
+            self._entries.move_to_end(email_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, email_id: Optional[str] = None):
+        """Drop one email, or everything when email_id is None."""
+        with self._lock:
+            if email_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(email_id, None)
+    
+    def invalidate_address(self, email_address: str):
+        """Drop every cached email received at email_address (and any without an address)."""
+        with self._lock:
+            stale = [email_id for email_id, (address, _) in self._entries.items()
+                     if address in (email_address, None)]
+            for email_id in stale:
+                del self._entries[email_id]
+    
+    def stats(self) -> Dict:
+        """Return hit / miss counters."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class InboxCursor:
+    """
+    Tracks which emails of an inbox have already been seen.
+    
+    Instead of remembering every id, the cursor keeps a high-water mark
+    (the newest timestamp seen so far) plus the ids seen at exactly that
+    timestamp, so per-poll cost and memory stay bounded however long it
+    runs. An email whose timestamp is older than the high-water mark when
+    it first shows up is treated as already seen.
+    """
+    
+    def __init__(self, client: Optional["CleanTempMailClient"] = None,
+                 email_address: Optional[str] = None, skip_existing: bool = False):
+        """
+        Initialize the cursor.
+        
+        Args:
+            client: Client used by poll() (optional if only advance() is used)
+            email_address: Address polled by poll()
+            skip_existing: Treat the emails present at the first poll as seen
+        """
+        self.client = client
+        self.email_address = email_address
+        self.skip_existing = skip_existing
+        self.high_water = None
+        self._boundary_ids = set()
+        self._started = False
+    
+    def advance(self, emails: List[Dict]) -> List[Dict]:
+        """
+        Return the emails not seen before and move the cursor past them.
+        
+        Args:
+            emails: Current inbox listing (any order)
+        
+        Returns:
+            list: New emails, in the order they appear in `emails`
+        """
+        high_water = self.high_water
+        boundary_ids = self._boundary_ids
+        if high_water is None:
+            new_emails = list(emails)
+        else:
+            new_emails = [
+                e for e in emails
+                if e.get('timestamp', 0) > high_water
+                or (e.get('timestamp', 0) == high_water and e['id'] not in boundary_ids)
+            ]
+        
+        if new_emails:
+            newest = max(e.get('timestamp', 0) for e in new_emails)
+            newest_ids = {e['id'] for e in new_emails if e.get('timestamp', 0) == newest}
+            if high_water is None or newest > high_water:
+                self.high_water = newest
+                self._boundary_ids = newest_ids
+            else:
+                boundary_ids.update(newest_ids)
+        
+        if not self._started:
+            self._started = True
+            if self.skip_existing:
+                return []
+        return new_emails
+    
+    def poll(self) -> List[Dict]:
+        """
+        Fetch the inbox and return only the emails not seen before.
+        
+        Returns:
+            list: New emails
+        """
+        return self.advance(self.client.get_emails(self.email_address))
+
+
+# Fields kept by CleanTempMailClient.list_headers()
+HEADER_FIELDS = ('id', 'from_address', 'email_address', 'subject', 'timestamp', 'has_html')
+
+
+class Email(Mapping):
+    """
+    Compact, read-only email record.
+    
+    Uses __slots__ instead of a per-object dict, keeps long content
+    zlib-compressed until it is first read, and converts the timestamp to
+    a datetime only when `datetime` is accessed. It behaves like the email
+    dict returned by the API, so code such as email['subject'] or
+    email.get('content', '') keeps working. Assigning to or deleting an
+    attribute raises AttributeError.
+    """
+    
+    __slots__ = ('id', 'from_address', 'email_address', 'subject', 'timestamp', 'has_html',
+                 '_content', '_compressed', '_datetime', '_extra')
+    
+    FIELDS = ('id', 'from_address', 'email_address', 'subject', 'timestamp', 'content', 'has_html')
+    _FIELD_SET = frozenset(FIELDS)
+    
+    # Content longer than this many characters is stored compressed
+    COMPRESS_THRESHOLD = 512
+    
+    def __init__(self, id: str, from_address: str = '', email_address: str = '', subject: str = '',
+                 timestamp: float = 0, content: str = '', has_html: bool = False,
+                 extra: Optional[Dict] = None):
+        _set = object.__setattr__
+        _set(self, 'id', id)
+        _set(self, 'from_address', from_address)
+        _set(self, 'email_address', email_address)
+        _set(self, 'subject', subject)
+        _set(self, 'timestamp', timestamp)
+        _set(self, 'has_html', has_html)
+        if content and len(content) > self.COMPRESS_THRESHOLD:
+            _set(self, '_content', None)
+            _set(self, '_compressed', zlib.compress(content.encode('utf-8'), 1))
+        else:
+            _set(self, '_content', content)
+            _set(self, '_compressed', None)
+        _set(self, '_datetime', None)
+        _set(self, '_extra', extra or None)
+    
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"Email records are read-only (cannot set {name!r})")
+    
+    def __delattr__(self, name: str):
+        raise AttributeError(f"Email records are read-only (cannot delete {name!r})")
+    
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state):
+        # Restores content exactly as stored (still compressed if it was)
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+    
+    def __copy__(self) -> "Email":
+        # Read-only, so a shallow copy can be the record itself
+        return self
+    
+    def __deepcopy__(self, memo) -> "Email":
+        state = self.__getstate__()
+        email = memo[id(self)] = Email.__new__(Email)
+        email.__setstate__(state[:-1] + (copy.deepcopy(state[-1], memo),))
+        return email
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Email":
+        """Build a record from an email dict as returned by the API."""
+        extra = None
+        if not data.keys() <= cls._FIELD_SET:
+            extra = {k: v for k, v in data.items() if k not in cls._FIELD_SET}
+        return cls(data['id'], data.get('from_address', ''), data.get('email_address', ''),
+                   data.get('subject', ''), data.get('timestamp', 0), data.get('content', ''),
+                   data.get('has_html', False), extra)
+    
+    @property
+    def content(self) -> str:
+        """Email body, decompressed on first access."""
+        if self._content is None:
+            object.__setattr__(self, '_content', zlib.decompress(self._compressed).decode('utf-8'))
+            object.__setattr__(self, '_compressed', None)
+        return self._content
+    
+    @property
+    def datetime(self) -> datetime:
+        """Timestamp as a local datetime, converted on first access."""
+        if self._datetime is None:
+            object.__setattr__(self, '_datetime', datetime.fromtimestamp(self.timestamp))
+        return self._datetime
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            return getattr(self, key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from self.FIELDS
+        if self._extra is not None:
+            yield from self._extra
+    
+    def __len__(self) -> int:
+        return len(self.FIELDS) + (len(self._extra) if self._extra is not None else 0)
+    
+    def to_dict(self) -> Dict:
+        """Return a plain dict copy."""
+        return dict(self.items())
+    
+    def __repr__(self):
+        return f"Email(id={self.id!r}, subject={self.subject!r})"
+
+
+class _JSONArrayStream:
+    """
+    Incrementally parse the objects of one JSON array in a response body.
+    
+    Iterating reads the body in chunks, finds the array stored under `key`
+    and yields its items one by one as soon as each is complete, keeping
+    only the unparsed tail in memory. If the body has no such array, the
+    whole document is parsed into `document` and nothing is yielded.
+    """
+    
+    _WHITESPACE = ' \t\n\r,'
+    
+    def __init__(self, read: Callable[[int], bytes], key: str, chunk_size: int = 65536):
+        self.document = None
+        self._read = read
+        self._marker = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._eof = False
+    
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; False at end of body."""
+        if self._eof:
+            return False
+        chunk = self._read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            self._buffer += self._text_decoder.decode(b'', final=True)
+            return False
+        self._buffer += self._text_decoder.decode(chunk)
+        return True
+    
+    def __iter__(self) -> Iterator[Any]:
+        # Find the start of the array
+        searched = 0
+        while True:
+            match = self._marker.search(self._buffer, searched)
+            if match:
+                pos = match.end()
+                break
+            searched = max(0, len(self._buffer) - 256)
+            if not self._fill():
+                self.document = json.loads(self._buffer)
+                return
+        
+        while True:
+            buffer = self._buffer
+            while pos < len(buffer) and buffer[pos] in self._WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                if not self._fill():
+                    raise ValueError("Response body ended inside the array")
+                continue
+            if buffer[pos] == ']':
+                # Read the rest of the (small) document so the connection can be reused
+                while self._fill():
+                    pass
+                return
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            yield item
+            pos = end
+            if pos > self._chunk_size:
+                self._buffer = self._buffer[pos:]
+                pos = 0
+
+
+class BatchResult:
+    """Outcome of one item in a batch call: either a value or an error."""
+    
+    def __init__(self, key: Any, value: Any = None, error: Optional[Exception] = None):
+        self.key = key
+        self.value = value
+        self.error = error
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+    
+    def __repr__(self):
+        if self.ok:
+            return f"BatchResult({self.key!r}, value={self.value!r})"
+        return f"BatchResult({self.key!r}, error={self.error!r})"
 
 
 class CleanTempMailClient:
     """Client for CleanTempMail API."""
     
-    def __init__(self, api_key: str, base_url: str = "https://cleantempmail.com/api"):
+    def __init__(self, api_key: str, base_url: str = "https://cleantempmail.com/api",
+                 pool: Optional[ConnectionPool] = None, conditional: bool = True,
+                 cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None,
+                 retry: Optional[RetryPolicy] = None, circuit_breaker: Optional[CircuitBreaker] = None,
+                 body_cache: Optional[BodyCache] = None, compression: bool = True,
+                 codec: Optional[JSONCodec] = None):
         """
         Initialize the CleanTempMail client.
         
         Args:
             api_key: Your API key
             base_url: Base URL for the API (default: https://cleantempmail.com/api)
+            pool: Connection pool to send requests through (optional, may be
+                shared between clients and threads)
+            conditional: Send conditional GETs and reuse results on 304 (default: True)
+            cache: Response cache for the statistics endpoints (optional, off by default)
+            rate_limiter: Token bucket every request waits on (optional, may be shared)
+            retry: Retry policy (default: RetryPolicy(), up to 3 attempts for idempotent requests)
+            circuit_breaker: Per-endpoint circuit breakers (optional, may be shared)
+            body_cache: Cache for emails fetched by get_email (optional, may be shared)
+            compression: Ask for gzip/deflate-compressed responses (default: True)
+            codec: JSON codec for request and response bodies (default: default_codec())
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
+        self.pool = pool if pool is not None else ConnectionPool()
+        self.conditional_cache = ConditionalCache() if conditional else None
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.body_cache = body_cache
+        self.compression = compression
+        self.codec = codec if codec is not None else default_codec()
+        self._hooks = {'before_request': [], 'after_response': [], 'on_error': []}
+        self._hooked = False
+    
+    def add_hook(self, event: str, callback: Callable[[RequestEvent], None]):
+        """
+        Register a hook called for every request attempt.
+        
+        Args:
+            event: 'before_request', 'after_response' or 'on_error'
+            callback: Function taking a RequestEvent
+        """
+        if event not in self._hooks:
+            raise ValueError(f"Unknown hook event: {event!r}")
+        self._hooks[event].append(callback)
+        self._hooked = True
+    
+    def remove_hook(self, event: str, callback: Callable[[RequestEvent], None]):
+        """Unregister a hook added with add_hook()."""
+        self._hooks[event].remove(callback)
+        self._hooked = any(self._hooks.values())
+    
+    def close(self):
+        """Close idle connections held by the client's pool."""
+        self.pool.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def _make_request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict:
         """
         Make an HTTP request to the API.
         
+        Idempotent requests that fail with a transport error or HTTP 5xx are
+        retried according to `self.retry`; if a circuit breaker is set, the
+        request fails fast while the endpoint's circuit is open.
+        
         Args:
             endpoint: API endpoint (e.g., '/generate-email')
             method: HTTP method (GET, POST, DELETE)
@@ -40,32 +1594,145 @@ class CleanTempMailClient:
             dict: API response
         
         Raises:
-            Exception: If request fails
+            AuthenticationError: If the API key is invalid (HTTP 401)
+            RateLimitError: If the API answers HTTP 429
+            APIError: If the API answers with another error status
+            TransportError: If no response could be obtained
+            CircuitOpenError: If the endpoint's circuit breaker is open
         """
         url = f"{self.base_url}{endpoint}"
         headers = {
             "X-API-Key": self.api_key,
             "Content-Type": "application/json"
         }
+        if self.compression:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
         
         # Prepare request
+        body = None
         if data and method == 'POST':
-            json_data = json.dumps(data).encode('utf-8')
-            req = urllib.request.Request(url, data=json_data, headers=headers, method=method)
-        else:
-            req = urllib.request.Request(url, headers=headers, method=method)
+            body = self.codec.dumps(data)
+        
+        def attempt(number: int) -> Dict:
+            attempt_headers = dict(headers)
+            if not self._hooked:
+                return self._send(endpoint, url, method, body, attempt_headers)
+            event = RequestEvent(method, endpoint, number, attempt_headers, len(body) if body else 0)
+            return self._send_hooked(event, lambda: self._send(endpoint, url, method, body, attempt_headers, event))
+        
+        return self._with_retries(endpoint, method, attempt)
+    
+    def _with_retries(self, endpoint: str, method: str, attempt: Callable[[int], Any]) -> Any:
+        """
+        Call attempt(number) until it succeeds or the failure is final.
+        
+        Each attempt waits on the rate limiter and, if a circuit breaker is
+        set, fails fast while the endpoint's circuit is open. Transport
+        errors and HTTP 5xx are retried according to `self.retry`.
+        """
+        breaker = self.circuit_breaker
+        name = endpoint_name(endpoint)
+        number = 1
+        last_error = None
+        
+        while True:
+            if breaker is not None:
+                try:
+                    breaker.before(name)
+                except CircuitOpenError as e:
+                    # Opened (by another thread) while this request was waiting to retry
+                    if last_error is None:
+                        raise
+                    raise e from last_error
+            # Client-side throttling is not part of the request's latency
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+            try:
+                result = attempt(number)
+            except (TransportError, ServerError) as e:
+                if breaker is not None:
+                    breaker.failure(name)
+                    if breaker.state(name) == CircuitBreaker.OPEN:
+                        # No point retrying; report the failure that opened the circuit
+                        raise
+                if not self.retry.should_retry(method, e, number):
+                    raise
+                last_error = e
+            except Exception:
+                # Any other answer means the endpoint is up
+                if breaker is not None:
+                    breaker.success(name)
+                raise
+            else:
+                if breaker is not None:
+                    breaker.success(name)
+                return result
+            
+            time.sleep(self.retry.delay(number))
+            number += 1
+    
+    def _send_hooked(self, event: RequestEvent, send: Callable[[], Any], complete: bool = True) -> Any:
+        """
+        Run send() for one attempt, calling the registered hooks around it.
+        
+        With complete=False the after_response hooks are left to the caller
+        (for streamed responses, whose body is read later).
+        """
+        for hook in self._hooks['before_request']:
+            hook(event)
+        started = time.perf_counter()
+        try:
+            result = send()
+        except Exception as e:
+            event.elapsed = time.perf_counter() - started
+            event.error = e
+            for hook in self._hooks['on_error']:
+                hook(event)
+            raise
+        event.elapsed = time.perf_counter() - started
+        if complete:
+            for hook in self._hooks['after_response']:
+                hook(event)
+        return result
+    
+    def _send(self, endpoint: str, url: str, method: str, body: Optional[bytes], headers: Dict,
+              event: Optional[RequestEvent] = None) -> Dict:
+        """Send one attempt of a request and parse the response."""
+        cache = self.conditional_cache if method == 'GET' else None
+        if cache is not None:
+            conditional, cached = cache.request_headers(url)
+            headers.update(conditional)
+        
+        # Make request over a pooled keep-alive connection
+        try:
+            response = self.pool.request(method, url, body=body, headers=headers)
+        except (OSError, http.client.HTTPException) as e:
+            raise TransportError(f"{method} {endpoint} failed: {e or type(e).__name__}") from e
+        if event is not None:
+            event.status = response.status
+            event.bytes_in = len(response.body)
+        if response.status == 304 and cache is not None:
+            return self.codec.loads(cache.not_modified_body(url, cached))
+        if response.status >= 400:
+            raise _http_error(response.status, response.reason, response.headers)
         
-        # Make request
         try:
-            with urllib.request.urlopen(req) as response:
-                return json.loads(response.read().decode())
-        except urllib.error.HTTPError as e:
-            error_msg = f"HTTP {e.code}: {e.reason}"
-            if e.code == 401:
-                error_msg += " (Invalid API key)"
-            elif e.code == 429:
-                error_msg += " (Rate limit exceeded)"
-            raise Exception(error_msg)
+            body = _decode_body(response.body, response.headers.get('Content-Encoding'))
+        except zlib.error as e:
+            raise TransportError(f"{method} {endpoint} failed: corrupt compressed body ({e})") from e
+        if event is not None:
+            event.bytes_decoded = len(body)
+        result = self.codec.loads(body)
+        if cache is not None:
+            cache.store(url, response.headers, body, len(response.body))
+        return result
+    
+    def _cached_request(self, endpoint: str) -> Dict:
+        """GET endpoint through the response cache, if one is configured."""
+        if self.cache is None:
+            return self._make_request(endpoint)
+        return self.cache.get_or_fetch(endpoint, lambda: self._make_request(endpoint),
+                                       cacheable=lambda response: response.get('success'))
     
     def generate_email(self, prefix: Optional[str] = None, domain: Optional[str] = None) -> str:
         """
@@ -92,14 +1759,15 @@ class CleanTempMailClient:
         if response.get('success'):
             return response['data']['email']
         else:
-            raise Exception(response.get('error', 'Failed to generate email'))
+            raise APIError(response.get('error', 'Failed to generate email'))
     
-    def get_emails(self, email_address: str) -> List[Dict]:
+    def get_emails(self, email_address: str, typed: bool = False) -> List[Dict]:
         """
         Get emails for a specific address.
         
         Args:
             email_address: The temporary email address
+            typed: Return compact Email records instead of dicts
         
         Returns:
             list: List of email objects
@@ -108,9 +1776,129 @@ class CleanTempMailClient:
         response = self._make_request(f'/emails?{params}')
         
         if response.get('success'):
+            if typed:
+                return [Email.from_dict(e) for e in response['data']['emails']]
             return response['data']['emails']
         else:
-            raise Exception(response.get('error', 'Failed to get emails'))
+            raise APIError(response.get('error', 'Failed to get emails'))
+    
+    def iter_emails(self, email_address: str, chunk_size: int = 65536, typed: bool = False) -> Iterator[Dict]:
+        """
+        Iterate over the emails for an address while the response is parsed.
+        
+        Emails are decoded one at a time straight from the socket, so the
+        first one is available before the whole inbox has arrived and the
+        full list is never held in memory. Breaking out of the loop stops
+        reading (the connection is then closed instead of reused). Opening
+        the stream is retried like any other GET; a failure after emails
+        have been yielded is raised to the caller. Client hooks see the
+        successful attempt once iteration ends, however it ends.
+        
+        Args:
+            email_address: The temporary email address
+            chunk_size: Bytes read from the socket at a time
+            typed: Yield compact Email records instead of dicts
+        
+        Returns:
+            iterator: Email objects
+        """
+        params = urllib.parse.urlencode({'email': email_address})
+        endpoint = f'/emails?{params}'
+        headers = {"X-API-Key": self.api_key}
+        if self.compression:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+        
+        def attempt(number: int):
+            if not self._hooked:
+                return self._send_stream(endpoint, headers), None
+            event = RequestEvent('GET', endpoint, number, dict(headers), 0)
+            # after_response / on_error for the successful attempt run once iteration ends
+            return self._send_hooked(event, lambda: self._send_stream(endpoint, headers, event), complete=False), event
+        
+        stream, event = self._with_retries(endpoint, 'GET', attempt)
+        if event is None:
+            yield from self._stream_emails(stream, endpoint, chunk_size, typed)
+            return
+        
+        error = None
+        try:
+            yield from self._stream_emails(stream, endpoint, chunk_size, typed, event)
+        except Exception as e:
+            error = event.error = e
+            raise
+        finally:
+            # Also runs when the caller stops iterating early
+            for hook in self._hooks['on_error' if error is not None else 'after_response']:
+                hook(event)
+    
+    def _send_stream(self, endpoint: str, headers: Dict, event: Optional[RequestEvent] = None) -> StreamingResponse:
+        """Send one attempt of the streaming GET and check its status."""
+        url = f"{self.base_url}{endpoint}"
+        try:
+            stream = self.pool.stream('GET', url, headers=headers)
+        except (OSError, http.client.HTTPException) as e:
+            raise TransportError(f"GET {endpoint} failed: {e or type(e).__name__}") from e
+        if event is not None:
+            event.status = stream.status
+        if stream.status >= 400:
+            stream.close()
+            raise _http_error(stream.status, stream.reason, stream.headers)
+        return stream
+    
+    def _stream_emails(self, stream: StreamingResponse, endpoint: str, chunk_size: int, typed: bool,
+                       event: Optional[RequestEvent] = None) -> Iterator[Dict]:
+        """
+        Parse an open iter_emails stream and yield the emails.
+        
+        With an event, its elapsed time covers opening the stream and
+        producing each email, but not the caller's work between emails.
+        """
+        with stream:
+            # Compressed bodies are inflated chunk by chunk on their way to the parser
+            read = stream.read
+            if event is not None:
+                read = _CountingReader(read, event, 'bytes_in').read
+            decompressor = _decompressor(stream.headers.get('Content-Encoding'))
+            if decompressor is not None:
+                read = _DecompressingReader(read, decompressor).read
+            if event is not None:
+                read = _CountingReader(read, event, 'bytes_decoded').read
+            parser = _JSONArrayStream(read, 'emails', chunk_size)
+            emails = iter(parser)
+            while True:
+                started = time.perf_counter()
+                try:
+                    email = next(emails, _END)
+                except (OSError, http.client.HTTPException, zlib.error) as e:
+                    raise TransportError(f"GET {endpoint} failed: {e or type(e).__name__}") from e
+                finally:
+                    if event is not None:
+                        event.elapsed += time.perf_counter() - started
+                if email is _END:
+                    break
+                yield Email.from_dict(email) if typed else email
+            
+            if parser.document is not None:
+                raise APIError(parser.document.get('error', 'Failed to get emails'))
+    
+    def list_headers(self, email_address: str, fields: Iterable[str] = HEADER_FIELDS) -> List[Dict]:
+        """
+        List the emails for an address without their content.
+        
+        The inbox is parsed as a stream and every email is cut down to
+        `fields` as soon as it is decoded, so bodies are never held in
+        memory. Open the emails you need with get_email(), which goes
+        through the body cache when one is configured.
+        
+        Args:
+            email_address: The temporary email address
+            fields: Fields to keep (default: HEADER_FIELDS)
+        
+        Returns:
+            list: Email objects with only the requested fields
+        """
+        fields = tuple(fields)
+        return [{f: email[f] for f in fields if f in email} for email in self.iter_emails(email_address)]
     
     def get_email(self, email_id: str) -> Dict:
         """
@@ -122,12 +1910,19 @@ class CleanTempMailClient:
         Returns:
             dict: Email object
         """
+        if self.body_cache is not None:
+            email = self.body_cache.get(email_id)
+            if email is not None:
+                return email
+        
         response = self._make_request(f'/email/{email_id}')
         
         if response.get('success'):
+            if self.body_cache is not None:
+                self.body_cache.put(email_id, response['data'])
             return response['data']
         else:
-            raise Exception(response.get('error', 'Failed to get email'))
+            raise APIError(response.get('error', 'Failed to get email'))
     
     def delete_email(self, email_id: str) -> bool:
         """
@@ -140,6 +1935,8 @@ class CleanTempMailClient:
             bool: True if deleted successfully
         """
         response = self._make_request(f'/email/{email_id}', method='DELETE')
+        if self.body_cache is not None:
+            self.body_cache.invalidate(email_id)
         return response.get('success', False)
     
     def clear_inbox(self, email_address: str) -> int:
@@ -155,10 +1952,12 @@ class CleanTempMailClient:
         params = urllib.parse.urlencode({'email': email_address})
         response = self._make_request(f'/emails/clear?{params}', method='DELETE')
         
+        if self.body_cache is not None:
+            self.body_cache.invalidate_address(email_address)
         if response.get('success'):
             return response['data'].get('count', 0)
         else:
-            raise Exception(response.get('error', 'Failed to clear inbox'))
+            raise APIError(response.get('error', 'Failed to clear inbox'))
     
     def get_statistics(self) -> Dict:
         """
@@ -167,12 +1966,12 @@ class CleanTempMailClient:
         Returns:
             dict: Statistics object
         """
-        response = self._make_request('/stats')
+        response = self._cached_request('/stats')
         
         if response.get('success'):
             return response['data']
         else:
-            raise Exception(response.get('error', 'Failed to get statistics'))
+            raise APIError(response.get('error', 'Failed to get statistics'))
     
     def get_24h_distribution(self) -> List[Dict]:
         """
@@ -181,12 +1980,12 @@ class CleanTempMailClient:
         Returns:
             list: Hourly distribution data
         """
-        response = self._make_request('/statistics/24h')
+        response = self._cached_request('/statistics/24h')
         
         if response.get('success'):
             return response['data']
         else:
-            raise Exception(response.get('error', 'Failed to get distribution'))
+            raise APIError(response.get('error', 'Failed to get distribution'))
     
     def get_top_subjects(self, limit: int = 10) -> List[Dict]:
         """
@@ -198,44 +1997,100 @@ class CleanTempMailClient:
         Returns:
             list: Top subjects
         """
-        response = self._make_request('/statistics/top-subjects')
+        response = self._cached_request('/statistics/top-subjects')
         
         if response.get('success'):
             return response['data'][:limit]
         else:
-            raise Exception(response.get('error', 'Failed to get top subjects'))
+            raise APIError(response.get('error', 'Failed to get top subjects'))
     
-    def wait_for_email(self, email_address: str, timeout: int = 60, interval: int = 5) -> Optional[Dict]:
+    def _fan_out(self, func: Callable, keys: Iterable, max_workers: int) -> Iterator[BatchResult]:
+        """Run func(key) for every key on a thread pool, yielding results as they complete."""
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {executor.submit(func, key): key for key in keys}
+        try:
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    yield BatchResult(key, value=future.result())
+                except Exception as e:
+                    yield BatchResult(key, error=e)
+        finally:
+            # If the caller stops early, drop the calls that have not started yet
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def get_emails_many(self, email_addresses: Iterable[str], max_workers: int = 10) -> Iterator[BatchResult]:
+        """
+        Get emails for many addresses concurrently.
+        
+        Args:
+            email_addresses: Addresses to fetch
+            max_workers: Maximum number of requests in flight
+        
+        Returns:
+            iterator: BatchResult per address (key=address, value=list of emails),
+                in completion order
+        """
+        return self._fan_out(self.get_emails, email_addresses, max_workers)
+    
+    def generate_emails_many(self, count: int, domain: Optional[str] = None,
+                             max_workers: int = 10) -> Iterator[BatchResult]:
+        """
+        Generate many temporary email addresses concurrently.
+        
+        Args:
+            count: Number of addresses to generate
+            domain: Specific domain (optional)
+            max_workers: Maximum number of requests in flight
+        
+        Returns:
+            iterator: BatchResult per request (key=index, value=address),
+                in completion order
+        """
+        return self._fan_out(lambda _: self.generate_email(domain=domain), range(count), max_workers)
+    
+    def wait_for_email(self, email_address: str, timeout: int = 60, interval: int = 5,
+                       strategy: Optional[PollingStrategy] = None) -> Optional[Dict]:
         """
         Wait for a new email to arrive.
         
+        The first poll records the emails already there; the inbox is then
+        re-checked at the delays given by `strategy` (the default starts at
+        0.5s). On HTTP 429 the wait honours the server's Retry-After.
+        
         Args:
             email_address: Email address to monitor
             timeout: Maximum wait time in seconds
-            interval: Polling interval in seconds
+            interval: Longest polling interval in seconds (used by the default strategy)
+            strategy: Polling strategy (default: ExponentialBackoff capped at `interval`)
         
         Returns:
             dict: First new email or None if timeout
         """
-        import time
-        
-        # Get current email IDs
-        initial_emails = self.get_emails(email_address)
-        initial_ids = {e['id'] for e in initial_emails}
+        if strategy is None:
+            strategy = ExponentialBackoff(initial=min(0.5, interval), maximum=interval)
+        strategy.reset()
         
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+        # The first successful poll records the emails already there
+        cursor = InboxCursor(self, email_address, skip_existing=True)
         
-        while time.time() - start_time < timeout:
-            time.sleep(interval)
+        while True:
+            retry_after = 0.0
+            try:
+                new_emails = cursor.poll()
+            except RateLimitError as e:
+                retry_after = e.retry_after or 0.0
+            else:
+                if new_emails:
+                    return new_emails[0]
             
-            current_emails = self.get_emails(email_address)
-            
-            # Check for new emails
-            for email in current_emails:
-                if email['id'] not in initial_ids:
-                    return email
-        
-        return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(max(strategy.next_delay(False), retry_after), remaining))
 
 
 if __name__ == "__main__":
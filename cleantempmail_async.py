@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+CleanTempMail Async API Client
+
+An asyncio counterpart to CleanTempMailClient. All requests share one
+aiohttp session (and its keep-alive connection pool), and the number of
+in-flight requests is capped so a single event loop can monitor thousands
+of addresses without overwhelming the API.
+
+Requires aiohttp (pip install -r requirements.txt).
+"""
+
+import asyncio
+import time
+import urllib.parse
+from typing import List, Dict, Optional
+
+from cleantempmail import (
+    APIError, ExponentialBackoff, InboxCursor, JSONCodec, PollingStrategy, RateLimitError, TransportError,
+    _http_error, default_codec,
+)
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class AsyncCleanTempMailClient:
+    """Async client for CleanTempMail API."""
+    
+    def __init__(self, api_key: str, base_url: str = "https://cleantempmail.com/api",
+                 max_concurrency: int = 100, keepalive_timeout: float = 60.0,
+                 session: Optional["aiohttp.ClientSession"] = None, codec: Optional[JSONCodec] = None):
+        """
+        Initialize the async CleanTempMail client.
+        
+        Args:
+            api_key: Your API key
+            base_url: Base URL for the API (default: https://cleantempmail.com/api)
+            max_concurrency: Maximum number of requests in flight at once
+            keepalive_timeout: Seconds an idle pooled connection is kept open
+            session: Existing aiohttp session to share (optional; not closed by close())
+            codec: JSON codec for request and response bodies (default: default_codec())
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncCleanTempMailClient requires aiohttp: pip install -r requirements.txt")
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.keepalive_timeout = keepalive_timeout
+        self.codec = codec if codec is not None else default_codec()
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = None
+    
+    def _get_session(self) -> "aiohttp.ClientSession":
+        # Created lazily so they bind to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def close(self):
+        """Close the underlying session if the client created it."""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def _make_request(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict:
+        """
+        Make an HTTP request to the API.
+        
+        Args:
+            endpoint: API endpoint (e.g., '/generate-email')
+            method: HTTP method (GET, POST, DELETE)
+            data: Request data for POST requests
+        
+        Returns:
+            dict: API response
+        
+        Raises:
+            AuthenticationError: If the API key is invalid (HTTP 401)
+            RateLimitError: If the API answers HTTP 429
+            APIError: If the API answers with another error status
+            TransportError: If no response could be obtained
+        """
+        url = f"{self.base_url}{endpoint}"
+        headers = {
+            "X-API-Key": self.api_key,
+            "Content-Type": "application/json"
+        }
+        
+        body = None
+        if data and method == 'POST':
+            body = self.codec.dumps(data)
+        
+        session = self._get_session()
+        async with self._semaphore:
+            try:
+                async with session.request(method, url, data=body, headers=headers) as response:
+                    if response.status >= 400:
+                        raise _http_error(response.status, response.reason, response.headers)
+                    return self.codec.loads(await response.read())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise TransportError(f"{method} {endpoint} failed: {e or type(e).__name__}") from e
+    
+    async def generate_email(self, prefix: Optional[str] = None, domain: Optional[str] = None) -> str:
+        """
+        Generate a temporary email address.
+        
+        Args:
+            prefix: Custom prefix (optional)
+            domain: Specific domain (optional)
+        
+        Returns:
+            str: Generated email address
+        """
+        data = {}
+        if prefix:
+            data['prefix'] = prefix
+        if domain:
+            data['domain'] = domain
+        
+        if data:
+            response = await self._make_request('/generate-email', method='POST', data=data)
+        else:
+            response = await self._make_request('/generate-email')
+        
+        if response.get('success'):
+            return response['data']['email']
+        else:
+            raise APIError(response.get('error', 'Failed to generate email'))
+    
+    async def get_emails(self, email_address: str) -> List[Dict]:
+        """
+        Get emails for a specific address.
+        
+        Args:
+            email_address: The temporary email address
+        
+        Returns:
+            list: List of email objects
+        """
+        params = urllib.parse.urlencode({'email': email_address})
+        response = await self._make_request(f'/emails?{params}')
+        
+        if response.get('success'):
+            return response['data']['emails']
+        else:
+            raise APIError(response.get('error', 'Failed to get emails'))
+    
+    async def get_email(self, email_id: str) -> Dict:
+        """
+        Get a single email by ID.
+        
+        Args:
+            email_id: Email ID
+        
+        Returns:
+            dict: Email object
+        """
+        response = await self._make_request(f'/email/{email_id}')
+        
+        if response.get('success'):
+            return response['data']
+        else:
+            raise APIError(response.get('error', 'Failed to get email'))
+    
+    async def delete_email(self, email_id: str) -> bool:
+        """
+        Delete a single email.
+        
+        Args:
+            email_id: Email ID
+        
+        Returns:
+            bool: True if deleted successfully
+        """
+        response = await self._make_request(f'/email/{email_id}', method='DELETE')
+        return response.get('success', False)
+    
+    async def clear_inbox(self, email_address: str) -> int:
+        """
+        Clear all emails for an address.
+        
+        Args:
+            email_address: The temporary email address
+        
+        Returns:
+            int: Number of emails deleted
+        """
+        params = urllib.parse.urlencode({'email': email_address})
+        response = await self._make_request(f'/emails/clear?{params}', method='DELETE')
+        
+        if response.get('success'):
+            return response['data'].get('count', 0)
+        else:
+            raise APIError(response.get('error', 'Failed to clear inbox'))
+    
+    async def get_statistics(self) -> Dict:
+        """
+        Get system statistics.
+        
+        Returns:
+            dict: Statistics object
+        """
+        response = await self._make_request('/stats')
+        
+        if response.get('success'):
+            return response['data']
+        else:
+            raise APIError(response.get('error', 'Failed to get statistics'))
+    
+    async def get_24h_distribution(self) -> List[Dict]:
+        """
+        Get 24-hour email distribution.
+        
+        Returns:
+            list: Hourly distribution data
+        """
+        response = await self._make_request('/statistics/24h')
+        
+        if response.get('success'):
+            return response['data']
+        else:
+            raise APIError(response.get('error', 'Failed to get distribution'))
+    
+    async def get_top_subjects(self, limit: int = 10) -> List[Dict]:
+        """
+        Get most common email subjects.
+        
+        Args:
+            limit: Number of results (default: 10)
+        
+        Returns:
+            list: Top subjects
+        """
+        response = await self._make_request('/statistics/top-subjects')
+        
+        if response.get('success'):
+            return response['data'][:limit]
+        else:
+            raise APIError(response.get('error', 'Failed to get top subjects'))
+    
+    async def wait_for_email(self, email_address: str, timeout: int = 60, interval: int = 5,
+                             strategy: Optional[PollingStrategy] = None) -> Optional[Dict]:
+        """
+        Wait for a new email to arrive without blocking the event loop.
+        
+        Polling works as in CleanTempMailClient.wait_for_email.
+        
+        Args:
+            email_address: Email address to monitor
+            timeout: Maximum wait time in seconds
+            interval: Longest polling interval in seconds (used by the default strategy)
+            strategy: Polling strategy (default: ExponentialBackoff capped at `interval`)
+        
+        Returns:
+            dict: First new email or None if timeout
+        """
+        if strategy is None:
+            strategy = ExponentialBackoff(initial=min(0.5, interval), maximum=interval)
+        strategy.reset()
+        
+        deadline = time.monotonic() + timeout
+        # The first successful poll records the emails already there
+        cursor = InboxCursor(skip_existing=True)
+        
+        while True:
+            retry_after = 0.0
+            try:
+                new_emails = cursor.advance(await self.get_emails(email_address))
+            except RateLimitError as e:
+                retry_after = e.retry_after or 0.0
+            else:
+                if new_emails:
+                    return new_emails[0]
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(max(strategy.next_delay(False), retry_after), remaining))
+
+
+if __name__ == "__main__":
+    async def main():
+        async with AsyncCleanTempMailClient("ct-test") as client:
+            print("Testing CleanTempMail Async API Client...")
+            print()
+            
+            emails = await asyncio.gather(*(client.generate_email() for _ in range(3)))
+            for email in emails:
+                print(f"✅ Generated: {email}")
+            
+            stats = await client.get_statistics()
+            print(f"✅ Total emails in system: {stats.get('total_emails', 0)}")
+        
+        print("\n💡 Async client is ready to use!")
+    
+    asyncio.run(main())
@@ -10,9 +10,11 @@ import json
 import urllib.request
 import urllib.parse
 import time
-import re
 from datetime import datetime
 
+from code_extractor import extract_codes
+from html_text import email_text
+
 # Configuration
 API_KEY = "ct-test"
 BASE_URL = "https://cleantempmail.com/api"
@@ -190,18 +192,16 @@ def demo_verification_code(email_address):
         emails = response['data']['emails']
         
         # Search for codes in emails
-        patterns = [r'\b\d{6}\b', r'\b\d{4}\b']
         found_codes = []
         
         for email in emails:
-            text = f"{email['subject']} {email.get('content', '')}"
-            for pattern in patterns:
-                codes = re.findall(pattern, text)
-                found_codes.extend(codes)
+            for code in extract_codes(email_text(email)):
+                if code not in found_codes:
+                    found_codes.append(code)
         
         if found_codes:
             print_success(f"Found {len(found_codes)} potential verification code(s):")
-            for code in set(found_codes)[:5]:  # Show unique codes
+            for code in found_codes[:5]:  # Show unique codes
                 print(f"   🔢 {code}")
         else:
             print_info("No verification codes found")
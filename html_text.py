@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+HTML to Text
+
+Turns HTML email bodies into the plain text a reader would see, so code
+extraction does not scan markup: style and script blocks are dropped,
+entities are decoded, block elements become line breaks and whitespace
+is collapsed. Input can be fed in chunks, and parsing stops as soon as
+the output reaches its size limit.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Iterable, Union
+
+# Elements whose content is never shown (not 'head': its end tag is optional)
+SKIP_TAGS = frozenset(('style', 'script', 'noscript', 'template', 'title', 'svg'))
+
+# Elements that start a new line
+BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'footer',
+    'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol',
+    'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul',
+))
+
+# Default cap on the text produced, in characters
+MAX_CHARS = 100000
+
+# Strings are parsed in slices of this many characters, so parsing can stop early
+FEED_CHUNK = 8192
+
+_SPACES_RE = re.compile(r'[ \t\r\f\v\xa0]+')
+_BLANK_LINES_RE = re.compile(r'\s*\n\s*')
+
+
+class HTMLToText(HTMLParser):
+    """
+    Incremental HTML-to-text converter.
+    
+    Call feed() with chunks of HTML (stop early once `full` is true) and
+    read `text` at the end.
+    """
+    
+    def __init__(self, max_chars: int = MAX_CHARS):
+        """
+        Args:
+            max_chars: Stop once this much text has been collected
+        """
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.full = False
+        self._parts = []
+        self._size = 0
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'body':
+            # Whatever was left unclosed before the body, the body is shown
+            self._skip_depth = 0
+        elif tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._parts.append('\n')
+    
+    def handle_startendtag(self, tag, attrs):
+        # <br/>, <hr/>, ... never open a skipped block
+        if tag in BLOCK_TAGS:
+            self._parts.append('\n')
+    
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self._parts.append('\n')
+    
+    def handle_data(self, data):
+        if self._skip_depth or self.full:
+            return
+        self._parts.append(data)
+        self._size += len(data)
+        if self._size >= self.max_chars:
+            self.full = True
+    
+    def feed(self, data: str):
+        if not self.full:
+            super().feed(data)
+    
+    @property
+    def text(self) -> str:
+        """Visible text so far, whitespace collapsed and capped at max_chars."""
+        text = _SPACES_RE.sub(' ', ''.join(self._parts))
+        return _BLANK_LINES_RE.sub('\n', text).strip()[:self.max_chars]
+
+
+def html_to_text(html: Union[str, Iterable[str]], max_chars: int = MAX_CHARS) -> str:
+    """
+    Convert HTML to visible plain text.
+    
+    Args:
+        html: HTML string, or an iterable of HTML chunks
+        max_chars: Maximum length of the returned text
+    
+    Returns:
+        str: Text with scripts and styles removed and entities decoded
+    """
+    parser = HTMLToText(max_chars)
+    if isinstance(html, str):
+        chunks = (html[i:i + FEED_CHUNK] for i in range(0, len(html), FEED_CHUNK))
+    else:
+        chunks = html
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.full:
+            break
+    else:
+        parser.close()
+    return parser.text
+
+
+def email_text(email, max_chars: int = MAX_CHARS) -> str:
+    """
+    Return an email's subject and readable content as one string.
+    
+    Content of emails with has_html set is converted with html_to_text.
+    
+    Args:
+        email: Email object (with 'subject', 'content' and 'has_html')
+        max_chars: Maximum length of the converted content
+    
+    Returns:
+        str: "subject content"
+    """
+    content = email.get('content') or ''
+    if email.get('has_html'):
+        content = html_to_text(content, max_chars)
+    return f"{email.get('subject', '')} {content}"
+
+
+if __name__ == "__main__":
+    sample = """<html><head><style>.btn { color: #A1B2C3D4; }</style></head>
+    <body><p>Your verification code is <b>482913</b>&nbsp;&mdash; it expires soon.</p>
+    <img src="https://t.example.com/open?id=7F3K9Q2Z"><script>track('X9Y8Z7W6')</script></body></html>"""
+    print(html_to_text(sample))
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Local Inbox Mirror
+
+Copies the emails of many addresses into a local SQLite database with an
+FTS5 full-text index on subject, sender and content. Syncing is
+incremental: per address the mirror remembers the newest timestamp it
+has stored and only inserts emails from that point on (email ids make
+repeated inserts harmless). Searches run locally, without API calls.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from cleantempmail import CleanTempMailClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS emails (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    address TEXT NOT NULL,
+    from_address TEXT NOT NULL DEFAULT '',
+    subject TEXT NOT NULL DEFAULT '',
+    content TEXT NOT NULL DEFAULT '',
+    timestamp REAL NOT NULL DEFAULT 0,
+    has_html INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (address, id)
+);
+CREATE INDEX IF NOT EXISTS emails_by_address ON emails (address, timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS emails_fts USING fts5(
+    subject, from_address, content, content='emails', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS emails_ai AFTER INSERT ON emails BEGIN
+    INSERT INTO emails_fts (rowid, subject, from_address, content)
+    VALUES (new.rowid, new.subject, new.from_address, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS emails_ad AFTER DELETE ON emails BEGIN
+    INSERT INTO emails_fts (emails_fts, rowid, subject, from_address, content)
+    VALUES ('delete', old.rowid, old.subject, old.from_address, old.content);
+END;
+CREATE TABLE IF NOT EXISTS sync_state (
+    address TEXT PRIMARY KEY,
+    high_water REAL NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+_COLUMNS = ('id', 'address', 'from_address', 'subject', 'content', 'timestamp', 'has_html')
+
+_INSERT = "INSERT OR IGNORE INTO emails (%s) VALUES (%s)" % (', '.join(_COLUMNS), ', '.join('?' * len(_COLUMNS)))
+
+
+def fts_query(text: str) -> str:
+    """Turn plain words into an FTS5 query matching all of them (no operators)."""
+    return ' '.join('"%s"' % word.replace('"', '""') for word in text.split())
+
+
+class InboxMirror:
+    """
+    SQLite mirror of many inboxes with full-text search.
+    
+    Thread-safe; sync() may be called from several threads, and one
+    database file may be shared by several processes (WAL mode).
+    """
+    
+    def __init__(self, client: Optional[CleanTempMailClient], path: str):
+        """
+        Open (or create) the mirror.
+        
+        Args:
+            client: Client used by sync() (optional if only searching)
+            path: Database file
+        """
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+    
+    def store(self, address: str, emails: Iterable[Dict]) -> int:
+        """
+        Insert the emails of one address that are newer than what is stored.
+        
+        Args:
+            address: Address the emails belong to
+            emails: Email objects as returned by get_emails
+        
+        Returns:
+            int: Number of emails added
+        """
+        with self._lock:
+            row = self._db.execute("SELECT high_water FROM sync_state WHERE address = ?", (address,)).fetchone()
+        high_water = row[0] if row else None
+        
+        # `emails` may be a network stream (sync), so it is consumed without the lock.
+        # Emails at exactly the high-water mark may be new; the id check skips stored ones.
+        rows = [
+            (e['id'], address, e.get('from_address', ''), e.get('subject', ''), e.get('content', ''),
+             e.get('timestamp', 0), int(bool(e.get('has_html'))))
+            for e in emails
+            if high_water is None or e.get('timestamp', 0) >= high_water
+        ]
+        newest = max([r[5] for r in rows], default=high_water if high_water is not None else 0)
+        
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                added = self._db.executemany(_INSERT, rows).rowcount
+                # A concurrent sync of the same address may have stored newer emails
+                self._db.execute(
+                    "INSERT INTO sync_state (address, high_water, synced_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT (address) DO UPDATE SET"
+                    " high_water = max(high_water, excluded.high_water), synced_at = excluded.synced_at",
+                    (address, newest, time.time()),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            return added
+    
+    def sync(self, address: str) -> int:
+        """
+        Fetch one inbox and store its new emails.
+        
+        Returns:
+            int: Number of emails added
+        """
+        return self.store(address, self.client.iter_emails(address))
+    
+    def sync_many(self, addresses: Iterable[str], max_workers: int = 10) -> Dict[str, int]:
+        """
+        Fetch many inboxes concurrently and store their new emails.
+        
+        Args:
+            addresses: Addresses to sync
+            max_workers: Maximum number of requests in flight
+        
+        Returns:
+            dict: Address -> number of emails added (addresses that failed are left out)
+        """
+        added = {}
+        for result in self.client.get_emails_many(addresses, max_workers=max_workers):
+            if result.ok:
+                added[result.key] = self.store(result.key, result.value)
+        return added
+    
+    def search(self, query: str, address: Optional[str] = None, limit: int = 50,
+               order: str = 'newest', raw: bool = False) -> List[Dict]:
+        """
+        Full-text search over subject, sender and content.
+        
+        Args:
+            query: Words that must all appear (or an FTS5 query if raw=True,
+                e.g. 'subject:verification AND content:code')
+            address: Only search this address (optional)
+            limit: Maximum number of results
+            order: 'newest' (most recently stored first) or 'rank' (best match
+                first; ranks every match, so slower for common words)
+            raw: Pass query to FTS5 unchanged
+        
+        Returns:
+            list: Email objects
+        
+        Raises:
+            ValueError: If query is empty or order is unknown
+        """
+        if not query.strip():
+            raise ValueError("query must not be empty")
+        match = query if raw else fts_query(query)
+        if order == 'rank':
+            sql = ("SELECT e.* FROM emails_fts JOIN emails e ON e.rowid = emails_fts.rowid"
+                   " WHERE emails_fts MATCH ?%s ORDER BY rank LIMIT ?"
+                   % (" AND e.address = ?" if address is not None else ""))
+            params = [match, address, limit] if address is not None else [match, limit]
+        elif order != 'newest':
+            raise ValueError(f"Unknown order: {order!r}")
+        elif address is None:
+            # Walks the index newest first and stops after `limit` matches
+            sql = ("SELECT e.* FROM emails_fts JOIN emails e ON e.rowid = emails_fts.rowid"
+                   " WHERE emails_fts MATCH ? ORDER BY emails_fts.rowid DESC LIMIT ?")
+            params = [match, limit]
+        else:
+            # One inbox is small: check its emails against the index instead
+            sql = ("SELECT e.* FROM emails e JOIN emails_fts ON emails_fts.rowid = e.rowid"
+                   " WHERE e.address = ? AND emails_fts MATCH ? ORDER BY e.timestamp DESC LIMIT ?")
+            params = [address, match, limit]
+        with self._lock:
+            return [self._email(row) for row in self._db.execute(sql, params)]
+    
+    def emails(self, address: str, since: Optional[float] = None) -> List[Dict]:
+        """Return the stored emails of an address, newest first."""
+        sql = "SELECT * FROM emails WHERE address = ?"
+        params = [address]
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        with self._lock:
+            return [self._email(row) for row in self._db.execute(sql + " ORDER BY timestamp DESC", params)]
+    
+    @staticmethod
+    def _email(row: sqlite3.Row) -> Dict:
+        email = {column: row[column] for column in _COLUMNS}
+        email['has_html'] = bool(email['has_html'])
+        return email
+    
+    def prune(self, max_age: float) -> int:
+        """
+        Delete emails older than max_age seconds (by email timestamp).
+        
+        Returns:
+            int: Number of emails deleted
+        """
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM emails WHERE timestamp < ?", (time.time() - max_age,))
+            return cursor.rowcount
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM emails").fetchone()[0]
+    
+    def close(self):
+        with self._lock:
+            self._db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    client = CleanTempMailClient("ct-test")
+    address = client.generate_email()
+    
+    with InboxMirror(client, "inbox_mirror.db") as mirror:
+        print(f"✅ Synced {mirror.sync(address)} new emails for {address}")
+        for email in mirror.search("verification code", limit=5):
+            print(f"📧 {email['address']}: {email['subject']}")
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Multi-Inbox Watcher
+
+Watches many temporary email addresses from one process. Each address has
+its own polling strategy; the next poll time of every address is kept in
+a heap, a single scheduler thread hands due polls to a bounded thread
+pool, and new emails are passed to registered callbacks. Addresses can be
+added and removed while the watcher runs.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from cleantempmail import CleanTempMailClient, ExponentialBackoff, InboxCursor, PollingStrategy, RateLimitError
+from seen_store import SeenStore
+
+
+class _Watch:
+    """Polling state for one address."""
+    
+    def __init__(self, address: str, priority: int, strategy: PollingStrategy, skip_existing: bool):
+        self.address = address
+        self.priority = priority
+        self.strategy = strategy
+        self.cursor = InboxCursor(skip_existing=skip_existing)
+        self.active = True
+        self.seq = None  # seq of the queued poll; entries with another seq are stale
+        self.polls = 0
+        self.errors = 0
+        self.emails = 0
+
+
+class InboxWatcher:
+    """
+    Polls many inboxes on a few threads.
+    
+    Polls that are due wait in a ready queue ordered by priority (higher
+    first), so when the thread pool cannot keep up, important addresses
+    are polled before the others. An address is never polled by two
+    threads at once.
+    """
+    
+    def __init__(self, client: CleanTempMailClient, max_workers: int = 4, interval: float = 5.0,
+                 skip_existing: bool = True, store: Optional[SeenStore] = None):
+        """
+        Initialize the watcher (call start() to begin polling).
+        
+        Args:
+            client: Client used for polling (shared by all worker threads)
+            max_workers: Threads polling inboxes
+            interval: Longest polling interval of the default strategy, in seconds
+            skip_existing: Ignore emails already in an inbox when it is added
+            store: Emails already handled, shared by all addresses and kept across
+                restarts (optional, e.g. SQLiteSeenStore; use with skip_existing=False)
+        """
+        self.client = client
+        self.max_workers = max_workers
+        self.interval = interval
+        self.skip_existing = skip_existing
+        self.store = store
+        self._watches = {}
+        self._timers = []  # (due, seq, watch)
+        self._ready = []  # (-priority, due, seq, watch)
+        self._seq = itertools.count()
+        self._running = 0
+        self._polling = {}  # address -> watch being polled
+        self._email_callbacks = []
+        self._error_callbacks = []
+        self._cond = threading.Condition()
+        self._executor = None
+        self._thread = None
+        self._stopping = False
+        self.polls = 0
+        self.lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+    
+    def on_email(self, callback: Callable[[str, Dict], None]):
+        """Register callback(address, email) for every new email."""
+        self._email_callbacks.append(callback)
+        return callback
+    
+    def on_error(self, callback: Callable[[str, Exception], None]):
+        """Register callback(address, error) for failed polls and on_email callbacks that raise."""
+        self._error_callbacks.append(callback)
+        return callback
+    
+    def _schedule(self, watch: _Watch, delay: float):
+        """Queue the next poll of watch (replacing any queued one); called with the lock held."""
+        watch.seq = next(self._seq)
+        heapq.heappush(self._timers, (time.monotonic() + delay, watch.seq, watch))
+        self._cond.notify()
+    
+    def add(self, address: str, priority: int = 0, strategy: Optional[PollingStrategy] = None):
+        """
+        Start watching an address (polled right away).
+        
+        Adding an address that is already watched keeps its cursor and
+        updates its priority and strategy. If a poll of the address is
+        running, the next one starts after it finishes.
+        
+        Args:
+            address: Email address to watch
+            priority: Higher values are polled first when polls queue up
+            strategy: Polling strategy (default: ExponentialBackoff capped at `interval`)
+        """
+        if strategy is None:
+            strategy = ExponentialBackoff(initial=min(0.5, self.interval), maximum=self.interval)
+        strategy.reset()
+        with self._cond:
+            watch = self._watches.get(address)
+            if watch is None:
+                watch = self._watches[address] = _Watch(address, priority, strategy, self.skip_existing)
+            else:
+                watch.priority = priority
+                watch.strategy = strategy
+            if address in self._polling:
+                # Scheduled by _poll once the running poll (of this or a removed watch) ends
+                return
+            self._schedule(watch, 0.0)
+    
+    def remove(self, address: str) -> bool:
+        """
+        Stop watching an address. A poll already running still completes.
+        
+        Returns:
+            bool: True if the address was being watched
+        """
+        with self._cond:
+            watch = self._watches.pop(address, None)
+            if watch is None:
+                return False
+            # Entries left in the heaps are skipped when they come up
+            watch.active = False
+            return True
+    
+    def addresses(self) -> List[str]:
+        """Return the addresses being watched."""
+        with self._cond:
+            return list(self._watches)
+    
+    def _poll(self, watch: _Watch):
+        """Worker: poll one inbox, deliver new emails and reschedule it."""
+        delay = None
+        new_emails = []
+        strategy = watch.strategy
+        try:
+            new_emails = watch.cursor.advance(self.client.get_emails(watch.address))
+            if self.store is not None and new_emails:
+                new_emails = self.store.filter_new(watch.address, new_emails)
+        except RateLimitError as e:
+            watch.errors += 1
+            delay = max(watch.strategy.next_delay(False), e.retry_after or 0.0)
+            self._notify(self._error_callbacks, watch.address, e)
+        except Exception as e:
+            watch.errors += 1
+            self._notify(self._error_callbacks, watch.address, e)
+        
+        watch.polls += 1
+        watch.emails += len(new_emails)
+        for email in new_emails:
+            if not watch.active:
+                break
+            self._notify(self._email_callbacks, watch.address, email)
+        
+        if delay is None:
+            delay = watch.strategy.next_delay(bool(new_emails))
+        with self._cond:
+            self._running -= 1
+            del self._polling[watch.address]
+            current = self._watches.get(watch.address)
+            if current is not None and not self._stopping:
+                # Added again during the poll: poll it again right away
+                readded = current is not watch or current.strategy is not strategy
+                self._schedule(current, 0.0 if readded else delay)
+            self._cond.notify()
+    
+    def _notify(self, callbacks, address, value):
+        for callback in callbacks:
+            try:
+                callback(address, value)
+            except Exception as e:
+                # A failing callback must not stop the watcher; report it
+                # unless it was an error callback itself
+                if callbacks is not self._error_callbacks:
+                    self._notify(self._error_callbacks, address, e)
+    
+    def _run(self):
+        """Scheduler: move due polls to the ready queue and dispatch them."""
+        with self._cond:
+            while not self._stopping:
+                now = time.monotonic()
+                timers = self._timers
+                while timers and timers[0][0] <= now:
+                    due, seq, watch = heapq.heappop(timers)
+                    if watch.active and seq == watch.seq:
+                        heapq.heappush(self._ready, (-watch.priority, due, seq, watch))
+                
+                while self._ready and self._running < self.max_workers:
+                    _, due, seq, watch = heapq.heappop(self._ready)
+                    if not watch.active or seq != watch.seq:
+                        continue
+                    watch.seq = None
+                    lag = now - due
+                    self.polls += 1
+                    self.lag_seconds += lag
+                    self.max_lag_seconds = max(self.max_lag_seconds, lag)
+                    self._running += 1
+                    self._polling[watch.address] = watch
+                    self._executor.submit(self._poll, watch)
+                
+                if self._ready and self._running >= self.max_workers:
+                    timeout = None  # woken when a poll finishes
+                elif timers:
+                    timeout = timers[0][0] - now
+                else:
+                    timeout = None
+                self._cond.wait(timeout)
+    
+    def start(self):
+        """Start polling in the background."""
+        with self._cond:
+            if self._thread is not None:
+                return self
+            self._stopping = False
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inbox-watcher")
+            self._thread = threading.Thread(target=self._run, name="inbox-watcher-scheduler", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop scheduling polls and wait for running ones to finish."""
+        with self._cond:
+            if self._thread is None:
+                return
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+        if self.store is not None:
+            self.store.flush()
+        with self._cond:
+            self._thread = None
+            self._executor = None
+            # Queued polls are dropped; start() again polls every address right away
+            self._timers = []
+            self._ready = []
+            for watch in self._watches.values():
+                self._schedule(watch, 0.0)
+    
+    def stats(self) -> Dict:
+        """Return watcher-wide and per-address counters."""
+        with self._cond:
+            return {
+                'watched': len(self._watches),
+                'running': self._running,
+                'queued': len(self._ready),
+                'polls': self.polls,
+                'avg_lag_seconds': self.lag_seconds / self.polls if self.polls else 0.0,
+                'max_lag_seconds': self.max_lag_seconds,
+                'addresses': {
+                    address: {
+                        'priority': watch.priority,
+                        'polls': watch.polls,
+                        'errors': watch.errors,
+                        'emails': watch.emails,
+                    }
+                    for address, watch in self._watches.items()
+                },
+            }
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    client = CleanTempMailClient("ct-test")
+    addresses = [client.generate_email() for _ in range(3)]
+    
+    with InboxWatcher(client, max_workers=2) as watcher:
+        @watcher.on_email
+        def show(address, email):
+            print(f"📧 {address}: {email['subject']}")
+        
+        for address in addresses:
+            watcher.add(address)
+            print(f"👀 Watching {address}")
+        
+        print("\n⏳ Watching for 30 seconds...")
+        time.sleep(30)
+        print(f"\n📊 Polls: {watcher.stats()['polls']}")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Keyword Email Router
+
+Sends each incoming email to every handler whose keyword appears in it.
+All keywords are compiled once into an Aho-Corasick automaton, so an
+email's subject and body are scanned in a single pass however many
+keywords are registered, instead of one substring check per handler.
+Matching is case-insensitive, like `keyword.lower() in subject.lower()`.
+"""
+
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed set of keywords.
+    
+    The failure links are folded into a full transition table, so the
+    scan does one dict lookup per character and never backtracks.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Build the automaton.
+        
+        Args:
+            keywords: Keywords to find (matched case-insensitively)
+        """
+        self.keywords = []
+        index = {}
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword and keyword not in index:
+                index[keyword] = len(self.keywords)
+                self.keywords.append(keyword)
+        
+        # Trie of all keywords
+        goto = [{}]
+        outputs = [()]
+        for i, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][ch] = next_state
+                state = next_state
+            outputs[state] += (i,)
+        
+        # Breadth-first: each state inherits the transitions and outputs of its failure state
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] += outputs[fail[state]]
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+            for ch, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(ch, 0)
+                queue.append(next_state)
+        
+        self._delta = delta
+        self._outputs = outputs
+    
+    def __len__(self) -> int:
+        return len(self.keywords)
+    
+    def _scan(self, text: str) -> List[int]:
+        """Return the states with matches reached while reading text (lowercased)."""
+        delta = self._delta
+        outputs = self._outputs
+        hits = []
+        append = hits.append
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                append(state)
+        return hits
+    
+    def matches(self, text: str) -> Set[int]:
+        """Return the indexes (into `keywords`) of the keywords found in text."""
+        outputs = self._outputs
+        found = set()
+        for state in set(self._scan(text.lower())):
+            found.update(outputs[state])
+        return found
+    
+    def find(self, text: str) -> Set[str]:
+        """Return the keywords found in text."""
+        return {self.keywords[i] for i in self.matches(text)}
+
+
+class KeywordRouter:
+    """
+    Dispatches emails to handlers registered for keywords.
+    
+    A handler registered for several keywords that all match is still
+    called once per email. Handlers can be added at any time; the
+    automaton is rebuilt on the next dispatch.
+    """
+    
+    def __init__(self, fields: Tuple[str, ...] = ('subject', 'content')):
+        """
+        Initialize the router.
+        
+        Args:
+            fields: Email fields to search for keywords
+        """
+        self.fields = fields
+        self._routes = []  # (keyword, handler), in registration order
+        self._automaton = None
+        self._handlers = None
+    
+    def add(self, keyword: str, handler: Callable[[Dict], None]):
+        """Call handler(email) for emails containing keyword."""
+        if not keyword:
+            raise ValueError("keyword must not be empty")
+        self._routes.append((keyword.lower(), handler))
+        self._automaton = None
+        return handler
+    
+    def route(self, keyword: str):
+        """Decorator form of add()."""
+        return lambda handler: self.add(keyword, handler)
+    
+    def _compile(self):
+        automaton = KeywordAutomaton(keyword for keyword, _ in self._routes)
+        index = {keyword: i for i, keyword in enumerate(automaton.keywords)}
+        # Per keyword: (registration order, handler) pairs
+        handlers = [[] for _ in automaton.keywords]
+        for order, (keyword, handler) in enumerate(self._routes):
+            handlers[index[keyword]].append((order, handler))
+        self._handlers = handlers
+        self._automaton = automaton
+    
+    def handlers_for(self, email: Dict) -> List[Callable[[Dict], None]]:
+        """Return the handlers matching email, in registration order."""
+        if self._automaton is None:
+            self._compile()
+        text = '\n'.join(email.get(field) or '' for field in self.fields)
+        matched = {}
+        for i in self._automaton.matches(text):
+            for order, handler in self._handlers[i]:
+                matched[order] = handler
+        # Each handler once, even if several of its keywords matched
+        unique = []
+        for order in sorted(matched):
+            handler = matched[order]
+            if handler not in unique:
+                unique.append(handler)
+        return unique
+    
+    def dispatch(self, email: Dict) -> int:
+        """
+        Call every handler matching email.
+        
+        Returns:
+            int: Number of handlers called
+        """
+        handlers = self.handlers_for(email)
+        for handler in handlers:
+            handler(email)
+        return len(handlers)
+
+
+if __name__ == "__main__":
+    router = KeywordRouter()
+    
+    @router.route("verification")
+    @router.route("code")
+    def verification(email):
+        print(f"🔐 Verification: {email['subject']}")
+    
+    @router.route("shipped")
+    def shipping(email):
+        print(f"📦 Shipping: {email['subject']}")
+    
+    router.dispatch({"subject": "Your Verification Code", "content": "Code: 482913"})
+    router.dispatch({"subject": "Order #1234 shipped", "content": "On its way"})
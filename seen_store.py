@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Seen-Email Stores
+
+Remember which emails a monitor has already handled, per address, so a
+restarted monitor only reports emails that are really new. SeenStore is
+the interface; MemorySeenStore keeps ids in process memory and
+SQLiteSeenStore keeps them in a SQLite database (WAL mode, batched
+commits, entries pruned by age) shared by many addresses and restarts.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class SeenStore:
+    """Interface for seen-email stores."""
+    
+    def filter_new(self, address: str, emails: Iterable[Dict]) -> List[Dict]:
+        """
+        Return the emails not seen before for address, and mark them seen.
+        
+        Args:
+            address: Email address the emails belong to
+            emails: Email objects (with 'id')
+        
+        Returns:
+            list: Unseen emails, in their original order
+        """
+        emails = list(emails)
+        unseen = self.unseen_ids(address, [e['id'] for e in emails])
+        new_emails = [e for e in emails if e['id'] in unseen]
+        self.add(address, [e['id'] for e in new_emails])
+        return new_emails
+    
+    def unseen_ids(self, address: str, email_ids: List[str]) -> Set[str]:
+        """Return the ids in email_ids that have not been seen for address."""
+        raise NotImplementedError
+    
+    def add(self, address: str, email_ids: Iterable[str]):
+        """Mark email ids as seen for address."""
+        raise NotImplementedError
+    
+    def flush(self):
+        """Write pending changes, if the store buffers any."""
+    
+    def close(self):
+        """Flush and release resources."""
+        self.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MemorySeenStore(SeenStore):
+    """Seen ids kept in memory (lost on restart)."""
+    
+    def __init__(self):
+        self._seen = {}
+        self._lock = threading.Lock()
+    
+    def unseen_ids(self, address: str, email_ids: List[str]) -> Set[str]:
+        with self._lock:
+            seen = self._seen.get(address, ())
+            return {email_id for email_id in email_ids if email_id not in seen}
+    
+    def add(self, address: str, email_ids: Iterable[str]):
+        with self._lock:
+            self._seen.setdefault(address, set()).update(email_ids)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT (or ROLLBACK on error) on an autocommit connection."""
+    
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+    
+    def __enter__(self):
+        self._db.execute("BEGIN IMMEDIATE")
+    
+    def __exit__(self, exc_type, *exc_info):
+        self._db.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+
+
+class SQLiteSeenStore(SeenStore):
+    """
+    Seen ids kept in a SQLite database.
+    
+    New ids are buffered and committed in batches (every `batch_size` ids
+    or `flush_interval` seconds, whichever comes first); buffered ids
+    already count as seen. Entries older than `max_age` are deleted when
+    the store is opened and every `prune_interval` seconds, so the file
+    stays bounded; `max_age` should exceed how long emails stay in an inbox.
+    The store is thread-safe and several processes may share one file.
+    """
+    
+    # Ids per "IN (...)" lookup, under SQLite's default variable limit
+    _LOOKUP_CHUNK = 500
+    
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 1.0,
+                 max_age: float = 7 * 86400, prune_interval: float = 3600.0):
+        """
+        Open (or create) the store.
+        
+        Args:
+            path: Database file
+            batch_size: Commit once this many ids are pending
+            flush_interval: Commit pending ids at least this often, in seconds
+            max_age: Seconds after which an entry is pruned (None: never prune)
+            prune_interval: Seconds between automatic prunes
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_age = max_age
+        self.prune_interval = prune_interval
+        self._pending = {}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+        self._last_prune = time.monotonic()
+        self._lock = threading.Lock()
+        
+        self._db = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " address TEXT NOT NULL, email_id TEXT NOT NULL, seen_at REAL NOT NULL,"
+            " PRIMARY KEY (address, email_id)) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS seen_by_age ON seen (seen_at)")
+        self.prune()
+    
+    def unseen_ids(self, address: str, email_ids: List[str]) -> Set[str]:
+        with self._lock:
+            pending = self._pending.get(address, ())
+            unseen = {email_id for email_id in email_ids if email_id not in pending}
+            candidates = list(unseen)
+            for i in range(0, len(candidates), self._LOOKUP_CHUNK):
+                chunk = candidates[i:i + self._LOOKUP_CHUNK]
+                rows = self._db.execute(
+                    "SELECT email_id FROM seen WHERE address = ? AND email_id IN (%s)"
+                    % ','.join('?' * len(chunk)),
+                    [address] + chunk,
+                )
+                unseen.difference_update(row[0] for row in rows)
+            return unseen
+    
+    def add(self, address: str, email_ids: Iterable[str]):
+        with self._lock:
+            pending = self._pending.setdefault(address, set())
+            before = len(pending)
+            pending.update(email_ids)
+            self._pending_count += len(pending) - before
+            if (self._pending_count >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush()
+    
+    def _flush(self):
+        """Commit pending ids in one transaction; called with the lock held."""
+        now = time.time()
+        if self._pending_count:
+            rows = [(address, email_id, now)
+                    for address, email_ids in self._pending.items() for email_id in email_ids]
+            with _Transaction(self._db):
+                self._db.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?, ?)", rows)
+            self._pending = {}
+            self._pending_count = 0
+        self._last_flush = time.monotonic()
+        if self.max_age is not None and time.monotonic() - self._last_prune >= self.prune_interval:
+            self._prune(self.max_age)
+    
+    def flush(self):
+        with self._lock:
+            self._flush()
+    
+    def _prune(self, max_age: float) -> int:
+        with _Transaction(self._db):
+            cursor = self._db.execute("DELETE FROM seen WHERE seen_at < ?", (time.time() - max_age,))
+        self._last_prune = time.monotonic()
+        return cursor.rowcount
+    
+    def prune(self, max_age: Optional[float] = None) -> int:
+        """
+        Delete entries older than max_age (default: the store's max_age).
+        
+        Returns:
+            int: Number of entries deleted
+        """
+        max_age = self.max_age if max_age is None else max_age
+        if max_age is None:
+            return 0
+        with self._lock:
+            return self._prune(max_age)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM seen").fetchone()[0] + self._pending_count
+    
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._db.close()
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    
+    path = os.path.join(tempfile.mkdtemp(), "seen.db")
+    emails = [{"id": f"email-{i}"} for i in range(5)]
+    
+    with SQLiteSeenStore(path) as store:
+        print(f"✅ First run:  {len(store.filter_new('test@cleantempmail.com', emails))} new emails")
+    
+    with SQLiteSeenStore(path) as store:
+        emails.append({"id": "email-5"})
+        print(f"✅ After restart: {len(store.filter_new('test@cleantempmail.com', emails))} new email")